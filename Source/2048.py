@@ -1,25 +1,191 @@
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import messagebox, filedialog
+from tkinter import font as tkfont
 import random
 import json
 import os
+import time
 from Highscore import HighscoreManager
+import Engine2048
+
+TILE_COLORS = {
+    0: ("#cdc1b4", "#776e65"),
+    2: ("#eee4da", "#776e65"),
+    4: ("#ede0c8", "#776e65"),
+    8: ("#f2b179", "#f9f6f2"),
+    16: ("#f59563", "#f9f6f2"),
+    32: ("#f67c5f", "#f9f6f2"),
+    64: ("#f65e3b", "#f9f6f2"),
+    128: ("#edcf72", "#f9f6f2"),
+    256: ("#edcc61", "#f9f6f2"),
+    512: ("#edc850", "#f9f6f2"),
+    1024: ("#edc53f", "#f9f6f2"),
+    2048: ("#edc22e", "#f9f6f2"),
+    4096: ("#3c3a32", "#f9f6f2"),
+    8192: ("#3c3a32", "#f9f6f2")
+}
+DEFAULT_TILE_COLORS = ("#3c3a32", "#f9f6f2")
+TILE_FONT_SIZES = (24, 20, 16, 14)
+BOARD_SIZES = tuple(range(Engine2048.MIN_SIZE, Engine2048.MAX_SIZE + 1))
+
+# Every game is recorded here (see Engine2048.replay) and can be played back
+REPLAY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Replays")
+
+# Slide animation: about 100 ms at 60 fps
+ANIMATION_FRAMES = 6
+FRAME_MS = 16
+
+
+class TileCanvas:
+    """The board drawn on one Canvas, with tiles that slide between cells"""
+    
+    def __init__(self, parent, size, fonts, board_pixels=460, gap=12):
+        self.size = size
+        self.fonts = fonts
+        self.gap = gap
+        self.cell_size = (board_pixels - gap * (size + 1)) / size
+        self.canvas = tk.Canvas(parent, width=board_pixels, height=board_pixels, 
+                               bg="#bbada0", highlightthickness=0)
+        
+        for i in range(size):
+            for j in range(size):
+                x, y = self.cell_origin(i, j)
+                self.canvas.create_rectangle(x, y, x + self.cell_size, y + self.cell_size, 
+                                            fill=TILE_COLORS[0][0], outline="")
+        
+        # (row, col) -> [rectangle id, text id, value]
+        self.tiles = {}
+        self.merged_away = []
+        self.animating = False
+        self.animation_job = None
+    
+    def cell_origin(self, row, col):
+        return (self.gap + col * (self.cell_size + self.gap), 
+                self.gap + row * (self.cell_size + self.gap))
+    
+    def tile_font(self, value):
+        if value < 100:
+            return self.fonts[24]
+        elif value < 1000:
+            return self.fonts[20]
+        elif value < 10000:
+            return self.fonts[16]
+        return self.fonts[14]
+    
+    def create_tile(self, row, col, value):
+        x, y = self.cell_origin(row, col)
+        rect = self.canvas.create_rectangle(x, y, x + self.cell_size, y + self.cell_size, outline="")
+        text = self.canvas.create_text(x + self.cell_size / 2, y + self.cell_size / 2)
+        tile = [rect, text, 0]
+        self.style_tile(tile, value)
+        return tile
+    
+    def style_tile(self, tile, value):
+        bg_color, fg_color = TILE_COLORS.get(value, DEFAULT_TILE_COLORS)
+        self.canvas.itemconfig(tile[0], fill=bg_color)
+        self.canvas.itemconfig(tile[1], text=str(value), fill=fg_color, font=self.tile_font(value))
+        tile[2] = value
+    
+    def place_tile(self, tile, row, col):
+        x, y = self.cell_origin(row, col)
+        self.canvas.coords(tile[0], x, y, x + self.cell_size, y + self.cell_size)
+        self.canvas.coords(tile[1], x + self.cell_size / 2, y + self.cell_size / 2)
+    
+    def sync(self, grid):
+        # Bring the tiles in line with the grid, touching only cells that differ
+        if self.animating:
+            self.stop_animation()
+        for i in range(self.size):
+            for j in range(self.size):
+                value = grid[i][j]
+                tile = self.tiles.get((i, j))
+                if value == 0:
+                    if tile is not None:
+                        self.canvas.delete(tile[0], tile[1])
+                        del self.tiles[(i, j)]
+                elif tile is None:
+                    self.tiles[(i, j)] = self.create_tile(i, j, value)
+                elif tile[2] != value:
+                    self.style_tile(tile, value)
+    
+    def animate(self, paths, grid, on_done):
+        # paths come from Engine2048.tile_paths(); two tiles with one destination merge
+        arrived = {}
+        moving = []
+        for src, dst in paths:
+            tile = self.tiles.pop(src, None)
+            if tile is None:
+                continue
+            if dst in arrived:
+                self.merged_away.append(tile)
+            else:
+                arrived[dst] = tile
+            if src != dst:
+                x0, y0 = self.cell_origin(*src)
+                x1, y1 = self.cell_origin(*dst)
+                moving.append((tile, (x1 - x0) / ANIMATION_FRAMES, (y1 - y0) / ANIMATION_FRAMES))
+        for tile in self.tiles.values():
+            self.canvas.delete(tile[0], tile[1])
+        self.tiles = arrived
+        self.animating = True
+        self.animation_step(moving, ANIMATION_FRAMES, grid, on_done)
+    
+    def animation_step(self, moving, frames_left, grid, on_done):
+        if frames_left == 0:
+            self.animation_job = None
+            self.stop_animation()
+            self.sync(grid)
+            on_done()
+            return
+        for tile, dx, dy in moving:
+            self.canvas.move(tile[0], dx, dy)
+            self.canvas.move(tile[1], dx, dy)
+        self.animation_job = self.canvas.after(FRAME_MS, self.animation_step, 
+                                               moving, frames_left - 1, grid, on_done)
+    
+    def stop_animation(self):
+        # Jump straight to the end of the current slide
+        if self.animation_job is not None:
+            self.canvas.after_cancel(self.animation_job)
+            self.animation_job = None
+        for tile in self.merged_away:
+            self.canvas.delete(tile[0], tile[1])
+        self.merged_away = []
+        for (i, j), tile in self.tiles.items():
+            self.place_tile(tile, i, j)
+        self.animating = False
+
 
 class Game2048:
-    def __init__(self, master):
+    def __init__(self, master, ai_moves_per_second=4, size=4):
         self.master = master
         self.master.title("2048 Game")
         self.master.geometry("600x700")
         self.master.resizable(False, False)
         self.master.configure(bg="#faf8ef")
         
-        self.highscore_manager = HighscoreManager("2048")
-        self.grid = [[0] * 4 for _ in range(4)]
+        self.size = size
+        self.highscore_manager = HighscoreManager(self.highscore_name())
+        self.state = Engine2048.GameState(size)
+        self.rng = random.Random()
+        self.grid = [[0] * size for _ in range(size)]
         self.score = 0
         self.highscore = self.highscore_manager.get_highscore()
         self.is_game_over = False
         self.has_won = False
         self.game_over_widgets = []
+        self.pending_direction = None
+        
+        # AI autoplay
+        self.ai_player = None
+        self.ai_running = False
+        self.ai_speed = tk.IntVar(value=ai_moves_per_second)
+        
+        # Recording of the current game, and the moves left when playing one back
+        self.recorder = None
+        self.replay_moves = None
+        
+        self.board_size = tk.IntVar(value=size)
         
         self.create_widgets()
         self.start_game()
@@ -48,169 +214,253 @@ class Game2048:
         tk.Label(self.master, text="Join the numbers and get to the 2048 tile!", 
                 font=("Arial", 10), bg="#faf8ef", fg="#776e65").grid(row=1, column=0, pady=(0, 6))
         
-        new_game_btn = tk.Button(self.master, text="New Game", font=("Arial", 11, "bold"), 
+        controls_frame = tk.Frame(self.master, bg="#faf8ef")
+        controls_frame.grid(row=2, column=0, pady=(0, 8))
+        
+        new_game_btn = tk.Button(controls_frame, text="New Game", font=("Arial", 11, "bold"), 
                                 bg="#8f7a66", fg="white", activebackground="#9f8a76", 
                                 relief="flat", padx=18, pady=4, command=self.restart_game)
-        new_game_btn.grid(row=2, column=0, pady=(0, 8))
-        
-        game_frame = tk.Frame(self.master, bg="#bbada0", padx=6, pady=6)
-        game_frame.grid(row=3, column=0)
-        
-        self.cells = []
-        for i in range(4):
-            row = []
-            for j in range(4):
-                cell = tk.Label(game_frame, text="", width=7, height=3, 
-                              font=("Arial", 24, "bold"), bg="#cdc1b4", 
-                              fg="#776e65", relief="flat")
-                cell.grid(row=i, column=j, padx=4, pady=4)
-                row.append(cell)
-            self.cells.append(row)
+        new_game_btn.pack(side="left", padx=4)
+        
+        self.ai_button = tk.Button(controls_frame, text="AI Play", font=("Arial", 11, "bold"), 
+                                  bg="#8f7a66", fg="white", activebackground="#9f8a76", 
+                                  relief="flat", padx=18, pady=4, command=self.toggle_ai)
+        self.ai_button.pack(side="left", padx=4)
+        
+        self.replay_button = tk.Button(controls_frame, text="Replay", font=("Arial", 11, "bold"), 
+                                      bg="#8f7a66", fg="white", activebackground="#9f8a76", 
+                                      relief="flat", padx=12, pady=4, command=self.toggle_replay)
+        self.replay_button.pack(side="left", padx=4)
+        
+        tk.Label(controls_frame, text="Moves/s", font=("Arial", 9), bg="#faf8ef", fg="#776e65").pack(side="left", padx=(8, 0))
+        tk.Scale(controls_frame, from_=1, to=20, orient="horizontal", variable=self.ai_speed, 
+                length=100, showvalue=True, bg="#faf8ef", fg="#776e65", highlightthickness=0, 
+                troughcolor="#bbada0").pack(side="left")
+        
+        tk.Label(controls_frame, text="Board", font=("Arial", 9), bg="#faf8ef", fg="#776e65").pack(side="left", padx=(8, 2))
+        size_menu = tk.OptionMenu(controls_frame, self.board_size, *BOARD_SIZES, command=self.change_size)
+        size_menu.config(bg="#faf8ef", fg="#776e65", highlightthickness=0)
+        size_menu.pack(side="left")
+        
+        self.game_frame = tk.Frame(self.master, bg="#bbada0", padx=6, pady=6)
+        self.game_frame.grid(row=3, column=0)
+        
+        # Fonts are created once and shared by all tiles; their sizes follow the board size
+        self.tile_fonts = {size: tkfont.Font(family="Arial", size=size, weight="bold") for size in TILE_FONT_SIZES}
+        
+        self.board_view = None
+        self.build_board_view()
         
         tk.Label(self.master, text="Use Arrow Keys or WASD to move tiles", 
                 font=("Arial", 8), bg="#faf8ef", fg="#776e65").grid(row=4, column=0, pady=(8, 5))
         
         self.master.bind("<Key>", self.key_pressed)
 
-    def start_game(self):
-        self.grid = [[0] * 4 for _ in range(4)]
+    def highscore_name(self):
+        # Each board size keeps its own best score; 4x4 keeps the original file
+        return "2048" if self.size == 4 else f"2048_{self.size}x{self.size}"
+
+    def build_board_view(self):
+        # Only called when the board size changes, never per move
+        if self.board_view is not None:
+            self.board_view.stop_animation()
+            self.board_view.canvas.destroy()
+        for nominal, font in self.tile_fonts.items():
+            font.configure(size=max(8, round(nominal * 4 / self.size)))
+        self.board_view = TileCanvas(self.game_frame, self.size, self.tile_fonts)
+        self.board_view.canvas.pack()
+
+    def change_size(self, size):
+        size = int(size)
+        if size == self.size:
+            return
+        self.set_size(size)
+        self.restart_game()
+
+    def set_size(self, size):
+        self.stop_ai()
+        self.size = size
+        self.board_size.set(size)
+        self.ai_player = None
+        self.highscore_manager = HighscoreManager(self.highscore_name())
+        self.highscore = self.highscore_manager.get_highscore()
+        self.build_board_view()
+
+    def start_game(self, seed=None, record=True):
+        # Spawns come from a seeded RNG so the game can be rebuilt from its seed and moves
+        seed = Engine2048.new_seed() if seed is None else seed
+        self.state, self.rng = Engine2048.new_game(self.size, seed)
+        self.grid = self.state.to_grid()
         self.score = 0
         self.is_game_over = False
         self.has_won = False
-        self.add_new_tile()
-        self.add_new_tile()
+        self.pending_direction = None
+        self.close_recording()
+        if record:
+            name = f"2048_{self.size}x{self.size}_{time.strftime('%Y%m%d_%H%M%S')}_{seed & 0xFFFF:04x}.rec"
+            self.recorder = Engine2048.ReplayWriter(os.path.join(REPLAY_DIR, name), self.size, seed, 
+                                                    flush_every_move=True)
         self.update_grid()
 
+    def close_recording(self):
+        if self.recorder is None:
+            return
+        self.recorder.close()
+        if self.recorder.moves == 0:
+            # Games that were never played are not worth keeping
+            os.remove(self.recorder.path)
+        self.recorder = None
+
     def add_new_tile(self):
-        empty_cells = [(i, j) for i in range(4) for j in range(4) if self.grid[i][j] == 0]
-        if empty_cells:
-            i, j = random.choice(empty_cells)
-            self.grid[i][j] = 2 if random.random() < 0.9 else 4
+        index = self.state.spawn(self.rng)
+        if index is not None:
+            self.grid[index // self.size][index % self.size] = self.state.tile(index)
 
     def update_grid(self):
-        for i in range(4):
-            for j in range(4):
-                value = self.grid[i][j]
-                bg_color, fg_color = self.get_colors(value)
-                if value == 0:
-                    font_size = 24
-                elif value < 100:
-                    font_size = 24
-                elif value < 1000:
-                    font_size = 20
-                elif value < 10000:
-                    font_size = 16
-                else:
-                    font_size = 14
-                self.cells[i][j].config(text=str(value) if value != 0 else "", 
-                                       bg=bg_color, fg=fg_color,
-                                       font=("Arial", font_size, "bold"))
+        self.board_view.sync(self.grid)
         self.update_score()
 
     def update_score(self):
-        self.score_label.config(text=str(self.score))
-        self.highscore_label.config(text=str(self.highscore))
-
-    def get_colors(self, value):
-        colors = {
-            0: ("#cdc1b4", "#776e65"),
-            2: ("#eee4da", "#776e65"),
-            4: ("#ede0c8", "#776e65"),
-            8: ("#f2b179", "#f9f6f2"),
-            16: ("#f59563", "#f9f6f2"),
-            32: ("#f67c5f", "#f9f6f2"),
-            64: ("#f65e3b", "#f9f6f2"),
-            128: ("#edcf72", "#f9f6f2"),
-            256: ("#edcc61", "#f9f6f2"),
-            512: ("#edc850", "#f9f6f2"),
-            1024: ("#edc53f", "#f9f6f2"),
-            2048: ("#edc22e", "#f9f6f2"),
-            4096: ("#3c3a32", "#f9f6f2"),
-            8192: ("#3c3a32", "#f9f6f2")
-        }
-        return colors.get(value, ("#3c3a32", "#f9f6f2"))
+        score_text = str(self.score)
+        if self.score_label.cget("text") != score_text:
+            self.score_label.config(text=score_text)
+        highscore_text = str(self.highscore)
+        if self.highscore_label.cget("text") != highscore_text:
+            self.highscore_label.config(text=highscore_text)
 
     def key_pressed(self, event):
-        if self.is_game_over:
+        if self.is_game_over or self.replay_moves is not None:
             return
         key_map = {"Up": "Up", "Down": "Down", "Left": "Left", "Right": "Right",
                    "w": "Up", "s": "Down", "a": "Left", "d": "Right",
                    "W": "Up", "S": "Down", "A": "Left", "D": "Right"}
         direction = key_map.get(event.keysym)
         if direction:
-            moved = self.move(direction)
-            if moved:
-                self.add_new_tile()
-                self.update_grid()
-                self.check_win()
-                if self.check_game_over():
-                    self.game_over()
+            self.play_move(direction)
 
-    def move(self, direction):
-        def slide(row):
-            new_row = [i for i in row if i != 0]
-            new_row += [0] * (4 - len(new_row))
-            return new_row
-
-        def combine(row):
-            for i in range(3):
-                if row[i] == row[i + 1] and row[i] != 0:
-                    row[i] *= 2
-                    self.score += row[i]
-                    row[i + 1] = 0
-            return row
-
-        moved = False
-        for i in range(4):
-            if direction in ["Up", "Down"]:
-                col = [self.grid[j][i] for j in range(4)]
-                original_col = col[:]
-                if direction == "Up":
-                    new_col = slide(combine(slide(col)))
-                else:
-                    new_col = slide(combine(slide(col[::-1])))[::-1]
-                if original_col != new_col:
-                    moved = True
-                for j in range(4):
-                    self.grid[j][i] = new_col[j]
-            else:
-                row = self.grid[i][:]
-                original_row = row[:]
-                if direction == "Left":
-                    new_row = slide(combine(slide(row)))
-                else:
-                    new_row = slide(combine(slide(row[::-1])))[::-1]
-                if original_row != new_row:
-                    moved = True
-                self.grid[i] = new_row
+    def play_move(self, direction):
+        if self.board_view.animating:
+            # Input that arrives mid-animation is coalesced; only the latest direction is kept
+            self.pending_direction = direction
+            return False
+        paths = Engine2048.tile_paths(self.grid, direction)
+        moved = self.move(direction)
+        if moved:
+            if self.recorder is not None:
+                self.recorder.record(direction)
+            self.add_new_tile()
+            self.update_score()
+            self.board_view.animate(paths, self.grid, self.finish_move)
+        return moved
+
+    def finish_move(self):
+        self.check_win()
+        if self.check_game_over():
+            self.game_over()
+            return
+        if self.pending_direction is not None:
+            direction, self.pending_direction = self.pending_direction, None
+            self.play_move(direction)
+
+    def toggle_ai(self):
+        if self.ai_running:
+            self.stop_ai()
+            return
+        if self.replay_moves is not None:
+            return
+        if self.ai_player is None:
+            self.ai_player = Engine2048.ExpectimaxPlayer(size=self.size)
+        self.ai_running = True
+        self.ai_button.config(text="Stop AI")
+        self.ai_step()
+
+    def stop_ai(self):
+        self.ai_running = False
+        self.ai_button.config(text="AI Play")
+
+    def ai_step(self):
+        if not self.ai_running or self.is_game_over:
+            self.stop_ai()
+            return
+        # Search for most of the time slot between two moves, but never more than 0.2s
+        interval = 1.0 / max(1, self.ai_speed.get())
+        self.ai_player.time_budget = min(0.2, interval * 0.5)
+        direction = self.ai_player.choose_move(self.state.board)
+        if direction is None:
+            self.stop_ai()
+            return
+        self.play_move(direction)
+        self.master.after(int(interval * 1000), self.ai_step)
 
+    def toggle_replay(self):
+        if self.replay_moves is not None:
+            self.stop_replay()
+            return
+        path = filedialog.askopenfilename(parent=self.master, initialdir=REPLAY_DIR, 
+                                          filetypes=[("2048 recordings", "*.rec")])
+        if not path:
+            return
+        try:
+            replay = Engine2048.read_replay(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Replay", str(e))
+            return
+        self.start_replay(replay)
+
+    def start_replay(self, replay):
+        # Plays a recording back at the Moves/s speed; the keyboard is ignored meanwhile
+        self.stop_ai()
+        if replay.size != self.size:
+            self.set_size(replay.size)
+        for widget in self.game_over_widgets:
+            widget.destroy()
+        self.game_over_widgets = []
+        self.start_game(seed=replay.seed, record=False)
+        self.replay_moves = replay.directions()
+        self.replay_button.config(text="Stop Replay")
+        self.replay_step()
+
+    def stop_replay(self):
+        self.replay_moves = None
+        self.replay_button.config(text="Replay")
+
+    def replay_step(self):
+        if self.replay_moves is None:
+            return
+        if self.board_view.animating:
+            # Wait for the slide to finish so no recorded move is coalesced away
+            self.master.after(FRAME_MS, self.replay_step)
+            return
+        direction = next(self.replay_moves, None)
+        if direction is None or self.is_game_over:
+            self.stop_replay()
+            return
+        if not self.play_move(direction):
+            self.stop_replay()
+            messagebox.showerror("Replay", "The recording does not match this game.")
+            return
+        self.master.after(int(1000 / max(1, self.ai_speed.get())), self.replay_step)
+
+    def move(self, direction):
+        moved, points = self.state.move(direction)
         if moved:
-            if self.score > self.highscore:
+            self.grid = self.state.to_grid()
+            self.score += points
+            if self.score > self.highscore and self.replay_moves is None:
                 self.highscore = self.score
                 self.highscore_manager.save_highscore(self.highscore)
         
         return moved
 
     def check_win(self):
-        if not self.has_won:
-            for i in range(4):
-                for j in range(4):
-                    if self.grid[i][j] == 2048:
-                        self.has_won = True
-                        messagebox.showinfo("Congratulations!", "You reached 2048!\n\nYou can continue playing to get higher scores!")
-                        return True
+        if not self.has_won and self.state.max_tile >= 2048:
+            self.has_won = True
+            messagebox.showinfo("Congratulations!", "You reached 2048!\n\nYou can continue playing to get higher scores!")
+            return True
         return False
 
     def check_game_over(self):
-        for i in range(4):
-            for j in range(4):
-                if self.grid[i][j] == 0:
-                    return False
-                if i < 3 and self.grid[i][j] == self.grid[i + 1][j]:
-                    return False
-                if j < 3 and self.grid[i][j] == self.grid[i][j + 1]:
-                    return False
-        return True
+        return self.state.is_over
 
     def game_over(self):
         self.is_game_over = True
@@ -229,6 +479,8 @@ class Game2048:
         self.game_over_widgets = [overlay_frame]
     
     def restart_game(self):
+        self.stop_ai()
+        self.stop_replay()
         for widget in self.game_over_widgets:
             widget.destroy()
         self.game_over_widgets = []
@@ -238,3 +490,4 @@ if __name__ == "__main__":
     root = tk.Tk()
     game = Game2048(root)
     root.mainloop()
+    game.close_recording()
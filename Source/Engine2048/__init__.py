@@ -0,0 +1,4 @@
+from .board import DIRECTIONS, MIN_SIZE, MAX_SIZE, BoardRules, rules_for, move, tile_paths, from_grid, to_grid, empty_cells, spawn_tile, can_move, max_tile, transpose
+from .state import GameState
+from .replay import Replay, ReplayWriter, new_seed, new_game, read_replay, replay_game
+from .ai import ExpectimaxPlayer
@@ -0,0 +1,66 @@
+"""Headless 2048 simulations.
+
+Usage (from the Source folder):
+    python -m Engine2048 --policy expectimax --games 20 --jobs 4
+    python -m Engine2048 --replay Replays/2048_4x4_20240101_120000_1a2b.rec
+"""
+import argparse
+import os
+import sys
+import time
+
+from .board import MAX_SIZE, MIN_SIZE, SIZE
+from .replay import read_replay, replay_game
+from .simulate import POLICIES, run_games, summarize
+
+
+def replay_files(paths) -> int:
+    """Re-run recordings at full speed and print where each one ends"""
+    status = 0
+    for path in paths:
+        try:
+            result = replay_game(read_replay(path))
+        except (OSError, ValueError) as e:
+            print(f"{path}: {e}", file=sys.stderr)
+            status = 1
+            continue
+        rate = result["moves"] / result["seconds"] if result["seconds"] > 0 else 0.0
+        print(f"{path}: score {result['score']}, max tile {result['max_tile']}, "
+              f"{result['moves']} moves ({rate:.0f} moves/s)")
+    return status
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m Engine2048", description="Play 2048 games without a window")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="greedy")
+    parser.add_argument("--size", type=int, default=SIZE, choices=range(MIN_SIZE, MAX_SIZE + 1),
+                        metavar=f"{{{MIN_SIZE}..{MAX_SIZE}}}", help="board width and height")
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="game i uses seed + i")
+    parser.add_argument("--max-moves", type=int, default=None, help="stop each game after this many moves")
+    parser.add_argument("--budget", type=float, default=0.01, help="expectimax seconds per move")
+    parser.add_argument("--depth", type=int, default=3, help="expectimax maximum depth")
+    parser.add_argument("--replay", nargs="+", metavar="FILE", help="re-run recorded games instead of simulating")
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        return replay_files(args.replay)
+
+    options = {}
+    if args.policy == "expectimax":
+        options = {"time_budget": args.budget, "max_depth": args.depth}
+
+    start = time.perf_counter()
+    results = run_games(args.policy, args.games, args.jobs, args.seed, args.max_moves, args.size, **options)
+    report = summarize(results, time.perf_counter() - start)
+
+    print(f"Policy: {args.policy}, board: {args.size}x{args.size}, games: {report['games']}")
+    print(f"Score: mean {report['mean_score']:.0f}, best {report['best_score']}")
+    print("Max tile: " + ", ".join(f"{tile}: {count}" for tile, count in report["max_tiles"].items()))
+    print(f"Moves: {report['moves']} ({report['moves_per_second']:.0f} moves/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .board import DIRECTIONS, LAZY_TABLE_LIMIT, SIZE, BoardRules, rules_for
+
+# Heuristic weights for one row (applied to all rows and all columns)
+LOST_PENALTY = 200000.0
+MONOTONICITY_POWER = 4
+MONOTONICITY_WEIGHT = 47.0
+SUM_POWER = 3.5
+SUM_WEIGHT = 11.0
+MERGES_WEIGHT = 700.0
+EMPTY_WEIGHT = 270.0
+
+# Spawn distribution used by Game2048.add_new_tile()
+SPAWN_TWO = 0.9
+SPAWN_FOUR = 0.1
+
+# Chance branches less likely than this are scored by the heuristic instead of searched
+PROB_THRESHOLD = 0.0001
+
+_heuristic_table: Optional[List[Optional[float]]] = None
+
+
+class _Timeout(Exception):
+    pass
+
+
+class _LazyHeuristics(dict):
+    """Row scores for boards too big to tabulate, computed as rows are seen"""
+
+    def __init__(self, rules: BoardRules):
+        super().__init__()
+        self.rules = rules
+
+    def __missing__(self, row: int) -> float:
+        if len(self) >= LAZY_TABLE_LIMIT:
+            self.clear()
+        value = _row_heuristic(row, self.rules)
+        self[row] = value
+        return value
+
+
+def _row_heuristic(row: int, rules: Optional[BoardRules] = None) -> float:
+    rules = rules or rules_for(SIZE)
+    ranks = rules.unpack_row(row)
+    empty = ranks.count(0)
+    total = sum(rank ** SUM_POWER for rank in ranks)
+
+    merges = 0
+    prev = 0
+    counter = 0
+    for rank in ranks:
+        if rank == 0:
+            continue
+        if prev == rank:
+            counter += 1
+        elif counter > 0:
+            merges += 1 + counter
+            counter = 0
+        prev = rank
+    if counter > 0:
+        merges += 1 + counter
+
+    mono_left = mono_right = 0
+    for i in range(1, len(ranks)):
+        if ranks[i - 1] > ranks[i]:
+            mono_left += ranks[i - 1] ** MONOTONICITY_POWER - ranks[i] ** MONOTONICITY_POWER
+        else:
+            mono_right += ranks[i] ** MONOTONICITY_POWER - ranks[i - 1] ** MONOTONICITY_POWER
+
+    return (LOST_PENALTY + EMPTY_WEIGHT * empty + MERGES_WEIGHT * merges
+            - MONOTONICITY_WEIGHT * min(mono_left, mono_right) - SUM_WEIGHT * total)
+
+
+def heuristic_table() -> List[Optional[float]]:
+    """One slot per 4x4 row, scored the first time evaluate() meets the row.
+
+    Scoring all 65536 rows up front stalled the window for a fraction of a
+    second when the AI was first used.
+    """
+    global _heuristic_table
+    if _heuristic_table is None:
+        _heuristic_table = [None] * 65536
+    return _heuristic_table
+
+
+class ExpectimaxPlayer:
+    """Chooses moves by expectimax search over the tile-spawn distribution"""
+
+    def __init__(self, time_budget: float = 0.1, max_depth: int = 6, size: int = SIZE):
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.rules = rules_for(size)
+        self.heuristics = heuristic_table() if size == SIZE else _LazyHeuristics(self.rules)
+        self.table: Dict[int, Tuple[int, float]] = {}
+        self.deadline = 0.0
+        self.nodes = 0
+
+    def evaluate(self, board: int) -> float:
+        h = self.heuristics
+        rules = self.rules
+        if rules.size == SIZE:
+            columns = rules.transpose(board)
+            try:
+                return (h[board & 0xFFFF] + h[(board >> 16) & 0xFFFF]
+                        + h[(board >> 32) & 0xFFFF] + h[(board >> 48) & 0xFFFF]
+                        + h[columns & 0xFFFF] + h[(columns >> 16) & 0xFFFF]
+                        + h[(columns >> 32) & 0xFFFF] + h[(columns >> 48) & 0xFFFF])
+            except TypeError:
+                # A row met for the first time: score its slot and start over
+                for lines in (board, columns):
+                    for shift in (0, 16, 32, 48):
+                        row = (lines >> shift) & 0xFFFF
+                        if h[row] is None:
+                            h[row] = _row_heuristic(row, rules)
+                return self.evaluate(board)
+        row_mask = rules.row_mask
+        columns = rules.transpose(board)
+        return sum(h[(board >> shift) & row_mask] + h[(columns >> shift) & row_mask]
+                   for shift in rules.row_shifts)
+
+    def _max_node(self, board: int, depth: int, prob: float) -> float:
+        best = 0.0
+        move = self.rules.move
+        for direction in DIRECTIONS:
+            new_board = move(board, direction)[0]
+            if new_board != board:
+                best = max(best, self._chance_node(new_board, depth, prob))
+        return best
+
+    def _chance_node(self, board: int, depth: int, prob: float) -> float:
+        if depth <= 0 or prob < PROB_THRESHOLD:
+            return self.evaluate(board)
+
+        # Transposition table: the same board is often reached by different move orders
+        cached = self.table.get(board)
+        if cached is not None and cached[0] >= depth:
+            return cached[1]
+
+        self.nodes += 1
+        if not self.nodes & 7 and time.perf_counter() > self.deadline:
+            raise _Timeout
+        empty = self.rules.empty_cells(board)
+        prob /= len(empty)
+        total = 0.0
+        bits = self.rules.bits
+        for i in empty:
+            shift = bits * i
+            total += SPAWN_TWO * self._max_node(board | (1 << shift), depth - 1, prob * SPAWN_TWO)
+            total += SPAWN_FOUR * self._max_node(board | (2 << shift), depth - 1, prob * SPAWN_FOUR)
+        value = total / len(empty)
+        self.table[board] = (depth, value)
+        return value
+
+    def _best_move(self, board: int, depth: int) -> Optional[str]:
+        best_direction = None
+        best_value = -1.0
+        for direction in DIRECTIONS:
+            new_board = self.rules.move(board, direction)[0]
+            if new_board == board:
+                continue
+            value = self._chance_node(new_board, depth, 1.0)
+            if value > best_value:
+                best_direction, best_value = direction, value
+        return best_direction
+
+    def choose_move(self, board: int) -> Optional[str]:
+        """Best direction for a packed board, or None when no move is possible.
+
+        Searches one level deeper at a time while the next level is expected to
+        fit in the time budget (each level costs roughly ten times the last).
+        A level that still runs past the budget is abandoned, and the best
+        move of the last finished level is played.
+        """
+        self.table = {}
+        self.nodes = 0
+        start = time.perf_counter()
+        deadline = start + self.time_budget
+        best = None
+        for depth in range(1, self.max_depth + 1):
+            level_start = time.perf_counter()
+            # The first level always finishes, so there is a move to fall back on
+            self.deadline = deadline if depth > 1 else float("inf")
+            try:
+                move = self._best_move(board, depth)
+            except _Timeout:
+                break
+            if move is None:
+                return None
+            best = move
+            now = time.perf_counter()
+            if now + (now - level_start) * 10 > deadline:
+                break
+        return best
@@ -0,0 +1,272 @@
+import random
+from typing import Callable, Dict, List, Optional, Tuple
+
+# A board is packed into one int: each tile is an exponent (0 = empty, 1 = 2,
+# 2 = 4, ...) and the tile at (row, col) lives in bits bits * (size * row + col).
+# Boards up to 4x4 use 4 bits per tile (largest tile 32768), so every possible
+# row has a slot in a flat lookup table, filled the first time the row is moved;
+# bigger boards use 5 bits per tile and keep their rows in a bounded dict.
+SIZE = 4
+MIN_SIZE = 3
+MAX_SIZE = 8
+DIRECTIONS = ("Up", "Down", "Left", "Right")
+
+
+def _slide_line(tiles: List[int], max_exponent: int = 15) -> Tuple[List[int], int, List[List[int]]]:
+    """Slide a line of exponents towards index 0, merging each pair once.
+
+    Returns the new line, the points scored and, for every slot of the new
+    line, the indices of the old tiles that ended up there.
+    """
+    positions = [i for i, t in enumerate(tiles) if t != 0]
+    merged = []
+    sources = []
+    score = 0
+    k = 0
+    while k < len(positions):
+        value = tiles[positions[k]]
+        if k + 1 < len(positions) and tiles[positions[k + 1]] == value and value < max_exponent:
+            merged.append(value + 1)
+            sources.append([positions[k], positions[k + 1]])
+            score += 1 << (value + 1)
+            k += 2
+        else:
+            merged.append(value)
+            sources.append([positions[k]])
+            k += 1
+    padding = len(tiles) - len(merged)
+    return merged + [0] * padding, score, sources + [[] for _ in range(padding)]
+
+
+# Lazy row tables start over when they reach this many rows, so long games on
+# big boards do not grow them without bound
+LAZY_TABLE_LIMIT = 1 << 16
+
+
+class _LazyRowTable(dict):
+    """Row table for rows too many to tabulate: a row is computed the first time it is looked up"""
+
+    def __init__(self, compute: Callable[[int], int]):
+        super().__init__()
+        self.compute = compute
+
+    def __missing__(self, row: int) -> int:
+        if len(self) >= LAZY_TABLE_LIMIT:
+            self.clear()
+        value = self.compute(row)
+        self[row] = value
+        return value
+
+
+class BoardRules:
+    """Move and spawn rules for packed N x N boards; use rules_for() to share the tables"""
+
+    def __init__(self, size: int):
+        if not MIN_SIZE <= size <= MAX_SIZE:
+            raise ValueError(f"Board size must be between {MIN_SIZE} and {MAX_SIZE}")
+        self.size = size
+        self.bits = 4 if size <= 4 else 5
+        self.cell_mask = (1 << self.bits) - 1
+        self.max_exponent = self.cell_mask
+        self.row_bits = self.bits * size
+        self.row_mask = (1 << self.row_bits) - 1
+        self.row_shifts = tuple(self.row_bits * r for r in range(size))
+        self.cell_count = size * size
+
+        if size <= 4:
+            # One slot per possible row, filled in the first time the row is moved.
+            # Filling all 65536 rows up front took over a second at import
+            rows = 1 << self.row_bits
+            self.left_table = [None] * rows
+            self.right_table = [None] * rows
+            self.left_scores = [0] * rows
+            self.right_scores = [0] * rows
+        else:
+            self.left_table = _LazyRowTable(lambda row: self.slide_row(row)[0])
+            self.right_table = _LazyRowTable(lambda row: self.slide_row(row, True)[0])
+            self.left_scores = _LazyRowTable(lambda row: self.slide_row(row)[1])
+            self.right_scores = _LazyRowTable(lambda row: self.slide_row(row, True)[1])
+        # Only GameState needs this one, so it is filled in as rows are seen on every size
+        self.row_info = _LazyRowTable(self.describe_row)
+
+    def unpack_row(self, row: int) -> List[int]:
+        return [(row >> (self.bits * c)) & self.cell_mask for c in range(self.size)]
+
+    def pack_row(self, tiles: List[int]) -> int:
+        row = 0
+        for c, tile in enumerate(tiles):
+            row |= tile << (self.bits * c)
+        return row
+
+    def reverse_row(self, row: int) -> int:
+        return self.pack_row(self.unpack_row(row)[::-1])
+
+    def describe_row(self, row: int) -> Tuple[int, int, int]:
+        """(neighbouring tiles that could merge, bit mask of empty columns, largest exponent)"""
+        tiles = self.unpack_row(row)
+        pairs = sum(1 for a, b in zip(tiles, tiles[1:]) if a == b and 0 < a < self.max_exponent)
+        empty = sum(1 << c for c, tile in enumerate(tiles) if not tile)
+        return pairs, empty, max(tiles)
+
+    def column(self, board: int, col: int) -> int:
+        """Column `col` packed like a row, top tile first"""
+        bits, mask, size = self.bits, self.cell_mask, self.size
+        line = 0
+        for r in range(size):
+            line |= ((board >> (bits * (size * r + col))) & mask) << (bits * r)
+        return line
+
+    def slide_row(self, row: int, right: bool = False) -> Tuple[int, int]:
+        """Same rules as Game2048.move(): slide, merge each pair once, slide"""
+        tiles = self.unpack_row(row)
+        if right:
+            tiles.reverse()
+        result, score, _ = _slide_line(tiles, self.max_exponent)
+        if right:
+            result.reverse()
+        return self.pack_row(result), score
+
+    def transpose(self, board: int) -> int:
+        """Swap rows and columns"""
+        if self.size == 4:
+            # A few masks and shifts instead of a loop over the 16 tiles
+            a1 = board & 0xF0F00F0FF0F00F0F
+            a2 = board & 0x0000F0F00000F0F0
+            a3 = board & 0x0F0F00000F0F0000
+            a = a1 | (a2 << 12) | (a3 >> 12)
+            b1 = a & 0xFF00FF0000FF00FF
+            b2 = a & 0x00FF00FF00000000
+            b3 = a & 0x00000000FF00FF00
+            return b1 | (b2 >> 24) | (b3 << 24)
+        size, bits, mask = self.size, self.bits, self.cell_mask
+        result = 0
+        for r in range(size):
+            for c in range(size):
+                tile = (board >> (bits * (size * r + c))) & mask
+                if tile:
+                    result |= tile << (bits * (size * c + r))
+        return result
+
+    def _move_rows(self, board: int, table, scores, right: bool) -> Tuple[int, int]:
+        result = 0
+        score = 0
+        row_mask = self.row_mask
+        try:
+            for shift in self.row_shifts:
+                row = (board >> shift) & row_mask
+                result |= table[row] << shift
+                score += scores[row]
+        except TypeError:
+            # A 4x4 row moved for the first time: fill in its slot and start over
+            for shift in self.row_shifts:
+                row = (board >> shift) & row_mask
+                if table[row] is None:
+                    table[row], scores[row] = self.slide_row(row, right)
+            return self._move_rows(board, table, scores, right)
+        return result, score
+
+    def move(self, board: int, direction: str) -> Tuple[int, int]:
+        """Return (new board, points scored); the board is unchanged if nothing could move"""
+        if direction == "Left":
+            return self._move_rows(board, self.left_table, self.left_scores, False)
+        if direction == "Right":
+            return self._move_rows(board, self.right_table, self.right_scores, True)
+        if direction == "Up":
+            result, score = self._move_rows(self.transpose(board), self.left_table, self.left_scores, False)
+            return self.transpose(result), score
+        if direction == "Down":
+            result, score = self._move_rows(self.transpose(board), self.right_table, self.right_scores, True)
+            return self.transpose(result), score
+        raise ValueError(f"Unknown direction: {direction}")
+
+    def from_grid(self, grid: List[List[int]]) -> int:
+        board = 0
+        for r in range(self.size):
+            for c in range(self.size):
+                value = grid[r][c]
+                if value:
+                    board |= (value.bit_length() - 1) << (self.bits * (self.size * r + c))
+        return board
+
+    def to_grid(self, board: int) -> List[List[int]]:
+        grid = []
+        for r in range(self.size):
+            row = []
+            for c in range(self.size):
+                exponent = (board >> (self.bits * (self.size * r + c))) & self.cell_mask
+                row.append(1 << exponent if exponent else 0)
+            grid.append(row)
+        return grid
+
+    def empty_cells(self, board: int) -> List[int]:
+        """Tile indices (size * row + col) that are empty"""
+        bits, mask = self.bits, self.cell_mask
+        return [i for i in range(self.cell_count) if not (board >> (bits * i)) & mask]
+
+    def spawn_tile(self, board: int, rng: Optional[random.Random] = None) -> int:
+        """Put a 2 (90%) or a 4 (10%) on a random empty cell, like Game2048.add_new_tile()"""
+        rng = rng or random
+        empty = self.empty_cells(board)
+        if not empty:
+            return board
+        i = rng.choice(empty)
+        return board | ((1 if rng.random() < 0.9 else 2) << (self.bits * i))
+
+    def can_move(self, board: int) -> bool:
+        return any(self.move(board, direction)[0] != board for direction in DIRECTIONS)
+
+    def max_tile(self, board: int) -> int:
+        exponent = max((board >> (self.bits * i)) & self.cell_mask for i in range(self.cell_count))
+        return 1 << exponent if exponent else 0
+
+
+_rules: Dict[int, BoardRules] = {}
+
+
+def rules_for(size: int = SIZE) -> BoardRules:
+    """The rules for one board size, built once and shared"""
+    if size not in _rules:
+        _rules[size] = BoardRules(size)
+    return _rules[size]
+
+
+def tile_paths(grid: List[List[int]], direction: str) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    """Where every tile of `grid` ends up after a move, as ((row, col), (new_row, new_col)).
+
+    Two tiles with the same destination merged. Used to animate moves; the
+    rules are the same as move().
+    """
+    size = len(grid)
+    max_exponent = rules_for(size).max_exponent
+    paths = []
+    for n in range(size):
+        if direction == "Left":
+            line = [(n, k) for k in range(size)]
+        elif direction == "Right":
+            line = [(n, size - 1 - k) for k in range(size)]
+        elif direction == "Up":
+            line = [(k, n) for k in range(size)]
+        elif direction == "Down":
+            line = [(size - 1 - k, n) for k in range(size)]
+        else:
+            raise ValueError(f"Unknown direction: {direction}")
+        exponents = [grid[r][c].bit_length() - 1 if grid[r][c] else 0 for r, c in line]
+        _, _, sources = _slide_line(exponents, max_exponent)
+        for slot, indices in enumerate(sources):
+            for index in indices:
+                paths.append((line[index], line[slot]))
+    return paths
+
+
+# The classic 4x4 board keeps its module-level functions
+_standard = rules_for(SIZE)
+MAX_EXPONENT = _standard.max_exponent
+ROW_MASK = _standard.row_mask
+transpose = _standard.transpose
+move = _standard.move
+from_grid = _standard.from_grid
+to_grid = _standard.to_grid
+empty_cells = _standard.empty_cells
+spawn_tile = _standard.spawn_tile
+can_move = _standard.can_move
+max_tile = _standard.max_tile
@@ -0,0 +1,117 @@
+"""Seeded game recordings.
+
+A recording is the board size, the seed of the spawn RNG and the moves that
+changed the board. Replaying those moves with the same seed spawns the same
+tiles, so a game can be rebuilt exactly.
+
+File layout: the 5-byte magic b"2048R", a version byte, the board size as one
+byte and the seed as 8 little-endian bytes, then one byte per move (the index
+of the direction in DIRECTIONS). Moves are appended as they are played, so a
+recording stays readable even if the game is closed mid-way.
+"""
+import os
+import random
+import struct
+import time
+from typing import BinaryIO, Callable, Dict, Iterator, NamedTuple, Optional
+
+from .board import DIRECTIONS, SIZE
+from .state import GameState
+
+MAGIC = b"2048R"
+VERSION = 1
+_HEADER = struct.Struct("<5sBBQ")
+_DIRECTION_CODES = {direction: bytes([i]) for i, direction in enumerate(DIRECTIONS)}
+
+
+class Replay(NamedTuple):
+    size: int
+    seed: int
+    moves: bytes
+
+    def directions(self) -> Iterator[str]:
+        for code in self.moves:
+            yield DIRECTIONS[code]
+
+
+def new_seed() -> int:
+    return random.SystemRandom().getrandbits(64)
+
+
+def new_game(size: int = SIZE, seed: int = 0):
+    """A new game and its spawn RNG, with the two starting tiles placed like Game2048"""
+    rng = random.Random(seed)
+    state = GameState(size)
+    state.spawn(rng)
+    state.spawn(rng)
+    return state, rng
+
+
+class ReplayWriter:
+    """Appends the moves of one game to a recording file"""
+
+    def __init__(self, path: str, size: int, seed: int, flush_every_move: bool = False):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.flush_every_move = flush_every_move
+        self.moves = 0
+        self._file: Optional[BinaryIO] = open(path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, VERSION, size, seed))
+        self._file.flush()
+
+    def record(self, direction: str):
+        self._file.write(_DIRECTION_CODES[direction])
+        self.moves += 1
+        if self.flush_every_move:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_replay(path: str) -> Replay:
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < _HEADER.size:
+        raise ValueError(f"{path} is not a 2048 recording")
+    magic, version, size, seed = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a 2048 recording")
+    moves = data[_HEADER.size:]
+    if any(code >= len(DIRECTIONS) for code in set(moves)):
+        raise ValueError(f"{path} has an unknown move code")
+    return Replay(size, seed, moves)
+
+
+def replay_game(replay: Replay, on_move: Optional[Callable[[GameState, str, int], None]] = None) -> Dict:
+    """Re-run a recording without a window, as fast as possible.
+
+    on_move(state, direction, points) is called after every move and spawn.
+    Raises ValueError if a recorded move does not change the board, which
+    means the recording does not belong to these rules or this seed.
+    """
+    state, rng = new_game(replay.size, replay.seed)
+    score = 0
+    moves = 0
+    start = time.perf_counter()
+    for direction in replay.directions():
+        moved, points = state.move(direction)
+        if not moved:
+            raise ValueError(f"Recorded move {moves + 1} ({direction}) does not move the board")
+        state.spawn(rng)
+        score += points
+        moves += 1
+        if on_move is not None:
+            on_move(state, direction, points)
+    return {"score": score, "max_tile": state.max_tile, "moves": moves,
+            "seconds": time.perf_counter() - start, "board": state.board}
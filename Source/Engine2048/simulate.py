@@ -0,0 +1,99 @@
+import random
+import time
+from collections import Counter
+from multiprocessing import Pool
+from typing import Callable, Dict, List, Optional
+
+from .ai import ExpectimaxPlayer
+from .board import DIRECTIONS, SIZE, rules_for
+
+# A policy gets the packed board and an RNG and returns a direction, or None to give up
+Policy = Callable[[int, random.Random], Optional[str]]
+
+
+def random_policy(size: int = SIZE) -> Policy:
+    move = rules_for(size).move
+
+    def choose(board: int, rng: random.Random) -> Optional[str]:
+        directions = [d for d in DIRECTIONS if move(board, d)[0] != board]
+        return rng.choice(directions) if directions else None
+    return choose
+
+
+def greedy_policy(size: int = SIZE) -> Policy:
+    """Take the most points now, preferring the move that leaves more empty cells"""
+    rules = rules_for(size)
+
+    def choose(board: int, rng: random.Random) -> Optional[str]:
+        best, best_key = None, None
+        for direction in DIRECTIONS:
+            new_board, points = rules.move(board, direction)
+            if new_board == board:
+                continue
+            key = (points, len(rules.empty_cells(new_board)), rng.random())
+            if best_key is None or key > best_key:
+                best, best_key = direction, key
+        return best
+    return choose
+
+
+def expectimax_policy(time_budget: float = 0.01, max_depth: int = 3, size: int = SIZE) -> Policy:
+    player = ExpectimaxPlayer(time_budget=time_budget, max_depth=max_depth, size=size)
+    return lambda board, rng: player.choose_move(board)
+
+
+POLICIES: Dict[str, Callable[..., Policy]] = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+    "expectimax": expectimax_policy,
+}
+
+
+def play_game(policy: Policy, rng: random.Random, max_moves: Optional[int] = None, size: int = SIZE) -> Dict:
+    """Play one game with the same move and spawn rules as Game2048"""
+    rules = rules_for(size)
+    board = rules.spawn_tile(rules.spawn_tile(0, rng), rng)
+    score = 0
+    moves = 0
+    start = time.perf_counter()
+    while max_moves is None or moves < max_moves:
+        direction = policy(board, rng)
+        if direction is None:
+            break
+        new_board, points = rules.move(board, direction)
+        if new_board == board:
+            break
+        board = rules.spawn_tile(new_board, rng)
+        score += points
+        moves += 1
+    return {"score": score, "max_tile": rules.max_tile(board), "moves": moves,
+            "seconds": time.perf_counter() - start}
+
+
+def _play_seeded(job) -> Dict:
+    policy_name, options, seed, max_moves, size = job
+    policy = POLICIES[policy_name](size=size, **options)
+    return play_game(policy, random.Random(seed), max_moves, size)
+
+
+def run_games(policy_name: str, games: int, jobs: int = 1, seed: int = 0,
+              max_moves: Optional[int] = None, size: int = SIZE, **options) -> List[Dict]:
+    """Play `games` games on a process pool; game i uses seed `seed + i`"""
+    work = [(policy_name, options, seed + i, max_moves, size) for i in range(games)]
+    if jobs <= 1:
+        return [_play_seeded(job) for job in work]
+    with Pool(jobs) as pool:
+        return list(pool.imap_unordered(_play_seeded, work))
+
+
+def summarize(results: List[Dict], wall_time: float) -> Dict:
+    scores = [r["score"] for r in results]
+    moves = sum(r["moves"] for r in results)
+    return {
+        "games": len(results),
+        "mean_score": sum(scores) / len(scores) if scores else 0.0,
+        "best_score": max(scores, default=0),
+        "max_tiles": dict(sorted(Counter(r["max_tile"] for r in results).items())),
+        "moves": moves,
+        "moves_per_second": moves / wall_time if wall_time > 0 else 0.0,
+    }
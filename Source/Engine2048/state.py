@@ -0,0 +1,125 @@
+import random
+from typing import List, Optional, Tuple
+
+from .board import SIZE, rules_for
+
+
+class GameState:
+    """A game in progress: the packed board plus totals kept up to date on every change.
+
+    The empty cells, the number of neighbouring tiles that could merge and the
+    biggest tile are adjusted only for the rows and columns a move or spawn
+    touched, so spawning and the win and game-over checks never rescan the board.
+    """
+
+    def __init__(self, size: int = SIZE, board: int = 0):
+        self.rules = rules_for(size)
+        self.set_board(board)
+
+    def set_board(self, board: int):
+        rules = self.rules
+        self.board = 0
+        # Empty cell indices, with the slot of each so one can be removed in O(1)
+        self.empty: List[int] = list(range(rules.cell_count))
+        self.empty_slot = {i: i for i in self.empty}
+        self.pairs = 0
+        self.top = 0
+        self._update(board)
+
+    def _update(self, board: int):
+        old = self.board
+        if old == board:
+            return
+        rules = self.rules
+        info = rules.row_info
+        row_mask = rules.row_mask
+        size = rules.size
+        for r, shift in enumerate(rules.row_shifts):
+            old_row = (old >> shift) & row_mask
+            new_row = (board >> shift) & row_mask
+            if old_row == new_row:
+                continue
+            old_pairs, old_empty, _ = info[old_row]
+            new_pairs, new_empty, new_top = info[new_row]
+            self.pairs += new_pairs - old_pairs
+            if new_top > self.top:
+                self.top = new_top
+            flipped = old_empty ^ new_empty
+            while flipped:
+                low = flipped & -flipped
+                flipped ^= low
+                i = r * size + low.bit_length() - 1
+                if new_empty & low:
+                    self._clear(i)
+                else:
+                    self._fill(i)
+
+        old_columns = rules.transpose(old)
+        new_columns = rules.transpose(board)
+        for shift in rules.row_shifts:
+            old_column = (old_columns >> shift) & row_mask
+            new_column = (new_columns >> shift) & row_mask
+            if old_column != new_column:
+                self.pairs += info[new_column][0] - info[old_column][0]
+        self.board = board
+
+    def _place(self, i: int, exponent: int):
+        # A single new tile only touches one row and one column
+        rules = self.rules
+        info = rules.row_info
+        row = i // rules.size
+        column = i % rules.size
+        shift = rules.row_shifts[row]
+        old_row = (self.board >> shift) & rules.row_mask
+        old_column = rules.column(self.board, column)
+        self.board |= exponent << (rules.bits * i)
+        self.pairs += (info[(self.board >> shift) & rules.row_mask][0] - info[old_row][0]
+                       + info[rules.column(self.board, column)][0] - info[old_column][0])
+        if exponent > self.top:
+            self.top = exponent
+        self._fill(i)
+
+    def _fill(self, i: int):
+        # Swap the last empty cell into the freed slot
+        slot = self.empty_slot.pop(i)
+        last = self.empty.pop()
+        if last != i:
+            self.empty[slot] = last
+            self.empty_slot[last] = slot
+
+    def _clear(self, i: int):
+        self.empty_slot[i] = len(self.empty)
+        self.empty.append(i)
+
+    def move(self, direction: str) -> Tuple[bool, int]:
+        """Play a move; returns (whether anything moved, points scored)"""
+        new_board, points = self.rules.move(self.board, direction)
+        if new_board == self.board:
+            return False, 0
+        self._update(new_board)
+        return True, points
+
+    def spawn(self, rng: Optional[random.Random] = None) -> Optional[int]:
+        """Put a 2 (90%) or a 4 (10%) on a random empty cell and return its index"""
+        if not self.empty:
+            return None
+        rng = rng or random
+        i = rng.choice(self.empty)
+        self._place(i, 1 if rng.random() < 0.9 else 2)
+        return i
+
+    def tile(self, index: int) -> int:
+        exponent = (self.board >> (self.rules.bits * index)) & self.rules.cell_mask
+        return 1 << exponent if exponent else 0
+
+    @property
+    def max_tile(self) -> int:
+        return 1 << self.top if self.top else 0
+
+    @property
+    def is_over(self) -> bool:
+        # A full board can only move if two neighbours can merge
+        return not self.empty and self.pairs == 0
+
+    def to_grid(self) -> List[List[int]]:
+        return self.rules.to_grid(self.board)
@@ -4,6 +4,10 @@ import time
 import sys
 import random
 from typing import Optional, Tuple
+from SudokuEngine import SudokuBoard, PuzzleBank, generate_puzzle, generate_graded_puzzle
+from SudokuEngine.solver import PEERS
+# Difficulty levels, as the number of blank cells
+from SudokuEngine import EASY, MEDIUM, HARD
 
 # UI Constants
 WIDTH = 850
@@ -31,16 +35,16 @@ BUTTON_CLICK = (67, 56, 202)
 TEXT_COLOR = (30, 41, 59)
 ACCENT_COLOR = (236, 72, 153)
 
-# Difficulty Levels
-EASY = 30
-MEDIUM = 45
-HARD = 60
+# Screen regions repainted on their own by render()
+NUMBER_PANEL_RECT = pygame.Rect(0, OFFSET_Y + BOARD_SIZE + 3, OFFSET_X + BOARD_SIZE + 20, HEIGHT - (OFFSET_Y + BOARD_SIZE + 3))
+SIDE_PANEL_RECT = pygame.Rect(OFFSET_X + BOARD_SIZE + 20, 0, WIDTH - (OFFSET_X + BOARD_SIZE + 20), HEIGHT)
 
-class Sudoku:
-    def __init__(self, board, difficulty=MEDIUM):
-        self.board = np.array(board)
-        self.original_board = self.board.copy()
+
+class Sudoku(SudokuBoard):
+    def __init__(self, board, difficulty=MEDIUM, puzzle_bank: Optional[PuzzleBank] = None):
+        super().__init__(board)
         self.difficulty = difficulty
+        self.puzzle_bank = puzzle_bank
         
         # Initialize pygame once
         if not pygame.font.get_init():
@@ -70,8 +74,8 @@ class Sudoku:
         
         # Game state
         self.selected_cell: Optional[Tuple[int, int]] = None
-        self.number_counts = {i: 9 for i in range(1, 10)}
-        self.update_number_counts()
+        # Cells whose state may have changed since the last frame, as board indices
+        self.dirty_cells = set()
         
         # Timer
         self.start_time = time.time()
@@ -85,61 +89,9 @@ class Sudoku:
         # Particles for celebration
         self.particles = []
         
+        self.build_static_surfaces()
         self.draw_board()
     
-    def is_valid(self, num: int, pos: Tuple[int, int]) -> bool:
-        row, col = pos
-        
-        # Check row
-        for i in range(9):
-            if self.board[row][i] == num and i != col:
-                return False
-        
-        # Check column
-        for i in range(9):
-            if self.board[i][col] == num and i != row:
-                return False
-        
-        # Check 3x3 box
-        box_row, box_col = row // 3, col // 3
-        for i in range(box_row * 3, box_row * 3 + 3):
-            for j in range(box_col * 3, box_col * 3 + 3):
-                if self.board[i][j] == num and (i, j) != pos:
-                    return False
-        
-        return True
-    
-    def solve(self) -> bool:
-        empty = self.find_empty()
-        if not empty:
-            return True
-        
-        row, col = empty
-        
-        for num in range(1, 10):
-            if self.is_valid(num, (row, col)):
-                self.board[row][col] = num
-                if self.solve():
-                    return True
-                self.board[row][col] = 0
-        
-        return False
-    
-    def find_empty(self) -> Optional[Tuple[int, int]]:
-        for i in range(9):
-            for j in range(9):
-                if self.board[i][j] == 0:
-                    return (i, j)
-        return None
-    
-    def update_number_counts(self):
-        self.number_counts = {i: 9 for i in range(1, 10)}
-        for i in range(9):
-            for j in range(9):
-                num = abs(self.board[i][j])
-                if num != 0:
-                    self.number_counts[num] -= 1
-    
     def draw_rounded_rect(self, surface, color, rect, radius=10, width=0):
         pygame.draw.rect(surface, color, rect, width, border_radius=radius)
     
@@ -156,115 +108,130 @@ class Sudoku:
         text_rect = text_surface.get_rect(center=rect.center)
         self.window.blit(text_surface, text_rect)
     
-    def draw_grid(self):
-        # Draw board background
-        board_rect = pygame.Rect(OFFSET_X, OFFSET_Y, BOARD_SIZE, BOARD_SIZE)
-        self.draw_rounded_rect(self.window, BOARD_BG, board_rect, radius=15)
+    def build_static_surfaces(self):
+        # The board background, grid lines, highlight overlays and digit glyphs never change,
+        # so they are drawn once and blitted from then on
+        self.grid_surface = pygame.Surface((BOARD_SIZE + 4, BOARD_SIZE + 4))
+        self.grid_surface.fill(BG_COLOR)
+        board_rect = pygame.Rect(2, 2, BOARD_SIZE, BOARD_SIZE)
+        self.draw_rounded_rect(self.grid_surface, BOARD_BG, board_rect, radius=15)
         
-        # Draw grid lines
         for i in range(10):
             thickness = 3 if i % 3 == 0 else 1
             color = GRID_THICK if i % 3 == 0 else GRID_LIGHT
-            
-            # Vertical lines
-            x = OFFSET_X + i * CELL_SIZE
-            pygame.draw.line(self.window, color, (x, OFFSET_Y), (x, OFFSET_Y + BOARD_SIZE), thickness)
-            
-            # Horizontal lines
-            y = OFFSET_Y + i * CELL_SIZE
-            pygame.draw.line(self.window, color, (OFFSET_X, y), (OFFSET_X + BOARD_SIZE, y), thickness)
+            pos = 2 + i * CELL_SIZE
+            pygame.draw.line(self.grid_surface, color, (pos, 2), (pos, 2 + BOARD_SIZE), thickness)
+            pygame.draw.line(self.grid_surface, color, (2, pos), (2 + BOARD_SIZE, pos), thickness)
+        
+        self.overlays = {}
+        for color in (SELECTED_COLOR, SAME_NUM_COLOR, HIGHLIGHT_COLOR):
+            overlay = pygame.Surface((CELL_SIZE - 4, CELL_SIZE - 4), pygame.SRCALPHA)
+            overlay.fill(color)
+            self.overlays[color] = overlay
+        
+        self.glyphs = {}
+        for color in (ORIGINAL_NUM_COLOR, INPUT_NUM_COLOR, WRONG_COLOR):
+            for num in range(1, 10):
+                self.glyphs[(num, color)] = self.font_large.render(str(num), True, color)
+        
+        self.drawn_cells = [None] * 81
+        self.drawn_counts = None
+        self.drawn_side_panel = None
+    
+    def draw_grid(self):
+        self.window.blit(self.grid_surface, (OFFSET_X - 2, OFFSET_Y - 2))
+    
+    def cell_rect(self, row: int, col: int) -> pygame.Rect:
+        return pygame.Rect(OFFSET_X + col * CELL_SIZE, OFFSET_Y + row * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+    
+    def number_color(self, row: int, col: int):
+        num = self.board[row][col]
+        if self.is_original(row, col):
+            return ORIGINAL_NUM_COLOR
+        elif num < 0:
+            return WRONG_COLOR
+        elif self.show_mistakes and (row, col) in self.conflict_cells:
+            return WRONG_COLOR
+        return INPUT_NUM_COLOR
+    
+    def cell_overlays(self, row: int, col: int) -> tuple:
+        if not self.selected_cell:
+            return ()
+        sel_row, sel_col = self.selected_cell
+        if (row, col) == self.selected_cell:
+            return (SELECTED_COLOR,)
+        
+        overlays = []
+        # Same numbers, then row and column, then 3x3 box
+        num = abs(self.board[sel_row][sel_col])
+        if num != 0 and abs(self.board[row][col]) == num:
+            overlays.append(SAME_NUM_COLOR)
+        if row == sel_row or col == sel_col:
+            overlays.append(HIGHLIGHT_COLOR)
+        if row // 3 == sel_row // 3 and col // 3 == sel_col // 3:
+            overlays.append(HIGHLIGHT_COLOR)
+        return tuple(overlays)
+    
+    def cell_state(self, row: int, col: int) -> tuple:
+        num = abs(self.board[row][col])
+        color = self.number_color(row, col) if num != 0 else None
+        return (num, color, self.cell_overlays(row, col))
+    
+    def cell_states(self) -> list:
+        return [self.cell_state(row, col) for row in range(9) for col in range(9)]
+    
+    def mark_dirty(self, cell: Optional[Tuple[int, int]]):
+        # A cell's number and highlight also show in its row, column, box and same-number cells
+        if cell is None:
+            return
+        row, col = cell
+        index = row * 9 + col
+        self.dirty_cells.add(index)
+        self.dirty_cells.update(PEERS[index])
+        num = abs(self.board[row][col])
+        if num != 0:
+            self.dirty_cells.update(np.flatnonzero(np.abs(self.board) == num).tolist())
+    
+    def select_cell(self, cell: Optional[Tuple[int, int]]):
+        if cell != self.selected_cell:
+            self.mark_dirty(self.selected_cell)
+            self.selected_cell = cell
+            self.mark_dirty(cell)
+    
+    def set_number(self, row: int, col: int, num: int) -> bool:
+        # Mark before and after so cells sharing the old and the new number are both repainted
+        self.mark_dirty((row, col))
+        changed = super().set_number(row, col, num)
+        self.mark_dirty((row, col))
+        return changed
+    
+    def draw_cell(self, row: int, col: int, state: tuple):
+        num, color, overlays = state
+        rect = self.cell_rect(row, col)
+        self.window.blit(self.grid_surface, rect, rect.move(2 - OFFSET_X, 2 - OFFSET_Y))
+        for overlay in overlays:
+            self.window.blit(self.overlays[overlay], (rect.x + 2, rect.y + 2))
+        if num != 0:
+            glyph = self.glyphs[(num, color)]
+            self.window.blit(glyph, glyph.get_rect(center=rect.center))
     
     def draw_numbers(self):
         for row in range(9):
             for col in range(9):
-                num = self.board[row][col]
+                num = abs(self.board[row][col])
                 if num != 0:
-                    x = OFFSET_X + col * CELL_SIZE + CELL_SIZE // 2
-                    y = OFFSET_Y + row * CELL_SIZE + CELL_SIZE // 2
-                    
-                    # Determine color based on cell type
-                    if self.original_board[row][col] != 0:
-                        color = ORIGINAL_NUM_COLOR
-                    elif num < 0:
-                        color = WRONG_COLOR
-                    elif self.show_mistakes and not self.is_valid(abs(num), (row, col)):
-                        color = WRONG_COLOR
-                    else:
-                        color = INPUT_NUM_COLOR
-                    
-                    text = self.font_large.render(str(abs(num)), True, color)
-                    text_rect = text.get_rect(center=(x, y))
-                    self.window.blit(text, text_rect)
+                    glyph = self.glyphs[(num, self.number_color(row, col))]
+                    self.window.blit(glyph, glyph.get_rect(center=self.cell_rect(row, col).center))
     
-    def draw_highlight(self):
-        if self.selected_cell:
-            row, col = self.selected_cell
-            
-            # Highlight selected cell
-            selected_rect = pygame.Rect(
-                OFFSET_X + col * CELL_SIZE + 2,
-                OFFSET_Y + row * CELL_SIZE + 2,
-                CELL_SIZE - 4,
-                CELL_SIZE - 4
-            )
-            s = pygame.Surface((CELL_SIZE - 4, CELL_SIZE - 4), pygame.SRCALPHA)
-            s.fill(SELECTED_COLOR)
-            self.window.blit(s, selected_rect)
-            
-            # Highlight same numbers
-            num = abs(self.board[row][col])
-            if num != 0:
-                for i in range(9):
-                    for j in range(9):
-                        if abs(self.board[i][j]) == num and (i, j) != (row, col):
-                            same_rect = pygame.Rect(
-                                OFFSET_X + j * CELL_SIZE + 2,
-                                OFFSET_Y + i * CELL_SIZE + 2,
-                                CELL_SIZE - 4,
-                                CELL_SIZE - 4
-                            )
-                            s = pygame.Surface((CELL_SIZE - 4, CELL_SIZE - 4), pygame.SRCALPHA)
-                            s.fill(SAME_NUM_COLOR)
-                            self.window.blit(s, same_rect)
-            
-            # Highlight row and column
-            for i in range(9):
-                if i != col:
-                    col_rect = pygame.Rect(
-                        OFFSET_X + i * CELL_SIZE + 2,
-                        OFFSET_Y + row * CELL_SIZE + 2,
-                        CELL_SIZE - 4,
-                        CELL_SIZE - 4
-                    )
-                    s = pygame.Surface((CELL_SIZE - 4, CELL_SIZE - 4), pygame.SRCALPHA)
-                    s.fill(HIGHLIGHT_COLOR)
-                    self.window.blit(s, col_rect)
-                
-                if i != row:
-                    row_rect = pygame.Rect(
-                        OFFSET_X + col * CELL_SIZE + 2,
-                        OFFSET_Y + i * CELL_SIZE + 2,
-                        CELL_SIZE - 4,
-                        CELL_SIZE - 4
-                    )
-                    s = pygame.Surface((CELL_SIZE - 4, CELL_SIZE - 4), pygame.SRCALPHA)
-                    s.fill(HIGHLIGHT_COLOR)
-                    self.window.blit(s, row_rect)
-            
-            # Highlight 3x3 box
-            box_row, box_col = row // 3, col // 3
-            for i in range(box_row * 3, box_row * 3 + 3):
-                for j in range(box_col * 3, box_col * 3 + 3):
-                    if (i, j) != (row, col):
-                        box_rect = pygame.Rect(
-                            OFFSET_X + j * CELL_SIZE + 2,
-                            OFFSET_Y + i * CELL_SIZE + 2,
-                            CELL_SIZE - 4,
-                            CELL_SIZE - 4
-                        )
-                        s = pygame.Surface((CELL_SIZE - 4, CELL_SIZE - 4), pygame.SRCALPHA)
-                        s.fill(HIGHLIGHT_COLOR)
-                        self.window.blit(s, box_rect)
+    def timer_text(self) -> str:
+        if self.timer_running:
+            self.elapsed_time = time.time() - self.start_time
+        
+        mins, secs = divmod(int(self.elapsed_time), 60)
+        return f"{mins:02d}:{secs:02d}"
+    
+    def side_panel_state(self) -> tuple:
+        return (self.timer_text(), self.difficulty, tuple(self.button_hovered.values()))
     
     def draw_side_panel(self):
         # Title
@@ -273,12 +240,7 @@ class Sudoku:
         self.window.blit(title, title_rect)
         
         # Timer
-        if self.timer_running:
-            self.elapsed_time = time.time() - self.start_time
-        
-        mins, secs = divmod(int(self.elapsed_time), 60)
-        time_text = f"{mins:02d}:{secs:02d}"
-        timer = self.font_medium.render(f"Time: {time_text}", True, TEXT_COLOR)
+        timer = self.font_medium.render(f"Time: {self.timer_text()}", True, TEXT_COLOR)
         timer_rect = timer.get_rect(center=(WIDTH - 115, 560))
         self.window.blit(timer, timer_rect)
         
@@ -346,11 +308,44 @@ class Sudoku:
         self.window.fill(BG_COLOR)
         self.draw_number_panel()
         self.draw_grid()
-        self.draw_highlight()
-        self.draw_numbers()
+        self.drawn_cells = self.cell_states()
+        self.dirty_cells.clear()
+        for index, state in enumerate(self.drawn_cells):
+            self.draw_cell(index // 9, index % 9, state)
         self.draw_side_panel()
+        self.drawn_counts = dict(self.number_counts)
+        self.drawn_side_panel = self.side_panel_state()
         pygame.display.flip()
     
+    def render(self):
+        # Repaint only the cells and panels whose contents changed since the last frame
+        dirty = []
+        
+        for index in self.dirty_cells:
+            row, col = index // 9, index % 9
+            state = self.cell_state(row, col)
+            if state != self.drawn_cells[index]:
+                self.draw_cell(row, col, state)
+                self.drawn_cells[index] = state
+                dirty.append(self.cell_rect(row, col))
+        self.dirty_cells.clear()
+        
+        if self.number_counts != self.drawn_counts:
+            self.window.fill(BG_COLOR, NUMBER_PANEL_RECT)
+            self.draw_number_panel()
+            self.drawn_counts = dict(self.number_counts)
+            dirty.append(NUMBER_PANEL_RECT)
+        
+        side_panel = self.side_panel_state()
+        if side_panel != self.drawn_side_panel:
+            self.window.fill(BG_COLOR, SIDE_PANEL_RECT)
+            self.draw_side_panel()
+            self.drawn_side_panel = side_panel
+            dirty.append(SIDE_PANEL_RECT)
+        
+        if dirty:
+            pygame.display.update(dirty)
+    
     def get_cell_from_pos(self, pos: Tuple[int, int]) -> Optional[Tuple[int, int]]:
         x, y = pos
         if OFFSET_X <= x < OFFSET_X + BOARD_SIZE and OFFSET_Y <= y < OFFSET_Y + BOARD_SIZE:
@@ -367,10 +362,10 @@ class Sudoku:
                 # Check board click
                 cell = self.get_cell_from_pos(pos)
                 if cell and not self.puzzle_solved:
-                    self.selected_cell = cell
-                    self.draw_board()
+                    self.select_cell(cell)
+                    self.render()
                 else:
-                    self.selected_cell = None
+                    self.select_cell(None)
                     
                     # Check button clicks
                     for key in ['new', 'reset', 'check', 'menu']:
@@ -383,25 +378,23 @@ class Sudoku:
                                 self.check_solution()
                             elif key == 'menu':
                                 return True  # Signal to go back to menu
-                    self.draw_board()
+                    self.render()
         
         elif event.type == pygame.KEYDOWN and self.selected_cell and not self.puzzle_solved:
             row, col = self.selected_cell
             
-            if self.original_board[row][col] == 0:
+            if not self.is_original(row, col):
                 if event.unicode.isdigit() and '1' <= event.unicode <= '9':
                     num = int(event.unicode)
-                    self.board[row][col] = num
-                    self.update_number_counts()
-                    self.draw_board()
+                    self.set_number(row, col, num)
+                    self.render()
                     
                     # Auto-check for mistakes if enabled
                     if self.show_mistakes and not self.is_valid(num, (row, col)):
                         pass  # Number will be shown in red
                 elif event.key == pygame.K_BACKSPACE or event.key == pygame.K_DELETE:
-                    self.board[row][col] = 0
-                    self.update_number_counts()
-                    self.draw_board()
+                    self.clear_number(row, col)
+                    self.render()
     
     def update_button_hover(self):
         mouse_pos = pygame.mouse.get_pos()
@@ -409,25 +402,15 @@ class Sudoku:
             self.button_hovered[key] = self.buttons[key].collidepoint(mouse_pos)
     
     def reset(self):
-        self.board = self.original_board.copy()
+        self.reset_board()
         self.selected_cell = None
         self.elapsed_time = 0
         self.start_time = time.time()
-        self.update_number_counts()
         self.draw_board()
     
     def check_solution(self):
         self.show_mistakes = True
-        mistakes = 0
-        empty = 0
-        
-        for i in range(9):
-            for j in range(9):
-                num = self.board[i][j]
-                if num == 0:
-                    empty += 1
-                elif not self.is_valid(abs(num), (i, j)):
-                    mistakes += 1
+        mistakes, empty = self.count_mistakes()
         
         self.draw_board()
         
@@ -480,10 +463,16 @@ class Sudoku:
         self.draw_board()
     
     def restart(self):
-        difficulty = self.difficulty
-        board = generate_random_board(difficulty)
-        self.__init__(board, difficulty)
-        return self.play()
+        # Reuse the open window; only the board and game state are replaced
+        self.load(next_board(self.difficulty, self.puzzle_bank))
+        self.selected_cell = None
+        self.start_time = time.time()
+        self.elapsed_time = 0
+        self.timer_running = True
+        self.puzzle_solved = False
+        self.show_mistakes = False
+        self.particles = []
+        self.draw_board()
     
     def play(self):
         clock = pygame.time.Clock()
@@ -502,53 +491,30 @@ class Sudoku:
                 if result == True:  # Menu button clicked
                     return True  # Return True to indicate menu should be shown
             
-            pygame.display.flip()
+            self.render()
             clock.tick(60)
         
         pygame.quit()
         return False
 
 
-def generate_random_board(difficulty: int = MEDIUM) -> np.ndarray:
-    # Create empty board
-    board = [[0 for _ in range(9)] for _ in range(9)]
-    
-    # Fill diagonal 3x3 boxes (independent)
-    for i in range(0, 9, 3):
-        nums = list(range(1, 10))
-        random.shuffle(nums)
-        for row in range(3):
-            for col in range(3):
-                board[i + row][i + col] = nums.pop()
-    
-    # Solve to fill the board
-    temp_sudoku = Sudoku(board)
-    temp_sudoku.solve()
-    filled_board = temp_sudoku.board.copy()
-    
-    # Remove numbers based on difficulty
-    cells = [(i, j) for i in range(9) for j in range(9)]
-    random.shuffle(cells)
-    
-    removed = 0
-    for cell in cells:
-        if removed >= difficulty:
-            break
-        row, col = cell
-        backup = filled_board[row][col]
-        filled_board[row][col] = 0
-        
-        # Check if still solvable
-        test_board = filled_board.copy()
-        temp_sudoku2 = Sudoku(test_board)
-        temp_sudoku2.solve()
-        
-        if temp_sudoku2.solve():
-            removed += 1
-        else:
-            filled_board[row][col] = backup
-    
-    return filled_board
+def generate_random_board(difficulty: int = MEDIUM, grade: Optional[str] = None) -> np.ndarray:
+    # Remove `difficulty` numbers while keeping exactly one solution, optionally
+    # retrying until the solving techniques needed match `grade` (see GRADES)
+    if grade is not None:
+        puzzle, _ = generate_graded_puzzle(difficulty, grade)
+    else:
+        puzzle, _ = generate_puzzle(difficulty)
+    return np.array(puzzle)
+
+
+def next_board(difficulty: int, puzzle_bank: Optional[PuzzleBank] = None) -> np.ndarray:
+    # Serve from the pre-generated pool, generating only when it has run dry
+    if puzzle_bank is not None:
+        board = puzzle_bank.pop(difficulty)
+        if board is not None:
+            return np.array(board)
+    return generate_random_board(difficulty)
 
 
 def select_difficulty() -> int:
@@ -606,14 +572,19 @@ def select_difficulty() -> int:
 
 
 if __name__ == "__main__":
-    while True:
-        difficulty = select_difficulty()
-        if difficulty is None:
-            break
-        board = generate_random_board(difficulty)
-        game = Sudoku(board, difficulty)
-        to_menu = game.play()
-        if to_menu:
-            continue  # Go back to difficulty selection
-        else:
-            break  # Game quit normally
+    puzzle_bank = PuzzleBank([EASY, MEDIUM, HARD])
+    puzzle_bank.start()
+    try:
+        while True:
+            difficulty = select_difficulty()
+            if difficulty is None:
+                break
+            board = next_board(difficulty, puzzle_bank)
+            game = Sudoku(board, difficulty, puzzle_bank)
+            to_menu = game.play()
+            if to_menu:
+                continue  # Go back to difficulty selection
+            else:
+                break  # Game quit normally
+    finally:
+        puzzle_bank.stop()
@@ -0,0 +1,5 @@
+from .solver import SudokuSolver, solve, count_solutions, parse_board, to_grid
+from .board import SudokuBoard
+from .generator import generate_solution, generate_puzzle, EASY, MEDIUM, HARD
+from .bank import PuzzleBank
+from .grader import TechniqueSolver, grade_puzzle, generate_graded_puzzle, GRADES, EASY_GRADE, MEDIUM_GRADE, HARD_GRADE, EXPERT_GRADE
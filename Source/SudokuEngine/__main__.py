@@ -0,0 +1,106 @@
+"""Batch Sudoku solver and grader.
+
+Usage (from the Source folder):
+    python -m SudokuEngine puzzles.txt -o solutions.txt -j 4
+    python -m SudokuEngine puzzles.txt --grade -o grades.txt
+
+Each input line holds one puzzle as 81 characters (digits, with 0 or . for
+empty cells); text after a comma is ignored so CSV corpora work as well.
+Every output line is "puzzle,solution,milliseconds", with an empty solution
+for unsolvable puzzles, or with --grade "puzzle,grade,score" (see grader).
+A throughput summary is printed to stderr.
+"""
+import argparse
+import os
+import sys
+import time
+from multiprocessing import Pool
+from collections import Counter
+from typing import Iterator, Tuple
+
+from .grader import GRADES, grade_puzzle
+from .solver import SudokuSolver
+
+
+def read_puzzles(path: str) -> Iterator[str]:
+    with open(path, "r") as f:
+        for line in f:
+            line = line.split(",", 1)[0].strip()
+            if len(line) == 81 and not line.startswith("#"):
+                yield line
+
+
+def solve_line(puzzle: str) -> Tuple[str, str, float]:
+    start = time.perf_counter()
+    try:
+        solution = SudokuSolver(puzzle).solve()
+    except ValueError:
+        solution = None
+    elapsed = time.perf_counter() - start
+    text = "".join(str(value) for row in solution for value in row) if solution else ""
+    return puzzle, text, elapsed
+
+
+def grade_line(puzzle: str) -> Tuple[str, str, int]:
+    grade, score = grade_puzzle(puzzle)
+    return puzzle, grade, score
+
+
+def grade_file(args) -> int:
+    out = open(args.output, "w") if args.output else sys.stdout
+    grades = Counter()
+    start = time.perf_counter()
+    try:
+        with Pool(args.jobs) as pool:
+            for puzzle, grade, score in pool.imap(grade_line, read_puzzles(args.puzzles), args.chunk_size):
+                out.write(f"{puzzle},{grade},{score}\n")
+                grades[grade] += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    count = sum(grades.values())
+    wall = time.perf_counter() - start
+    rate = count / wall if wall > 0 else 0.0
+    spread = ", ".join(f"{grades[grade]} {grade}" for grade in GRADES)
+    print(f"{count} puzzles graded in {wall:.2f}s ({rate:.0f} puzzles/s): {spread}", file=sys.stderr)
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m SudokuEngine", description="Solve or grade a file of Sudoku puzzles")
+    parser.add_argument("puzzles", help="file with one 81-character puzzle per line")
+    parser.add_argument("-o", "--output", help="where to write solutions (default: stdout)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=64, help="puzzles sent to a worker at a time")
+    parser.add_argument("--grade", action="store_true", help="write each puzzle's grade and score instead of solving")
+    args = parser.parse_args(argv)
+    if args.grade:
+        return grade_file(args)
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    count = solved = 0
+    solve_time = 0.0
+    start = time.perf_counter()
+    try:
+        with Pool(args.jobs) as pool:
+            # imap keeps the input order while the file is streamed in chunks
+            for puzzle, solution, elapsed in pool.imap(solve_line, read_puzzles(args.puzzles), args.chunk_size):
+                out.write(f"{puzzle},{solution},{elapsed * 1000:.3f}\n")
+                count += 1
+                solved += 1 if solution else 0
+                solve_time += elapsed
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    wall = time.perf_counter() - start
+    rate = count / wall if wall > 0 else 0.0
+    average = solve_time / count * 1000 if count else 0.0
+    print(f"{count} puzzles, {solved} solved in {wall:.2f}s "
+          f"({rate:.0f} puzzles/s, {average:.3f} ms average per puzzle)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
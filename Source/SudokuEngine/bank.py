@@ -0,0 +1,111 @@
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, List, Optional
+
+from .generator import generate_puzzle
+from .solver import parse_board, to_grid
+
+
+class PuzzleBank:
+    """Pre-generated puzzles per difficulty, kept topped up in the background.
+
+    Puzzles are stored on disk as one 81-digit line each, so a new game can be
+    served by a constant-time pop instead of generating on the UI thread. A
+    background thread hands the generation to a worker process, so the
+    pure-Python search does not hold the GIL while the game loop runs; if no
+    process can be started the thread generates the puzzles itself.
+    """
+
+    def __init__(self, difficulties: Iterable[int], pool_size: int = 10, bank_dir: str = "PuzzleBank"):
+        self.difficulties = list(difficulties)
+        self.pool_size = pool_size
+        self.bank_dir = self._get_bank_path(bank_dir)
+        self.pools: Dict[int, deque] = {d: deque() for d in self.difficulties}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_bank_path(self, bank_dir: str) -> str:
+        """Get the full path to the bank directory next to the game files"""
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return os.path.join(base_dir, bank_dir)
+
+    def _bank_file(self, difficulty: int) -> str:
+        return os.path.join(self.bank_dir, f"sudoku_{difficulty}.txt")
+
+    def load(self):
+        """Fill the in-memory pools from the puzzle files"""
+        for difficulty in self.difficulties:
+            path = self._bank_file(difficulty)
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, "r") as f:
+                    for line in f:
+                        line = line.strip()
+                        if len(line) == 81 and line.isdigit():
+                            self.pools[difficulty].append(line)
+            except OSError:
+                pass
+
+    def save(self):
+        """Write the puzzles that were not played back to disk"""
+        os.makedirs(self.bank_dir, exist_ok=True)
+        for difficulty in self.difficulties:
+            with open(self._bank_file(difficulty), "w") as f:
+                for line in list(self.pools[difficulty]):
+                    f.write(line + "\n")
+
+    def start(self):
+        self.load()
+        self._stop.clear()
+        try:
+            self._executor = ProcessPoolExecutor(max_workers=1)
+        except (OSError, NotImplementedError):
+            self._executor = None
+        self._worker = threading.Thread(target=self._refill, daemon=True)
+        self._worker.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        self.save()
+
+    def pop(self, difficulty: int) -> Optional[List[List[int]]]:
+        """Take a puzzle from the pool, or None if it is empty right now"""
+        self._wake.set()
+        try:
+            line = self.pools[difficulty].popleft()
+        except (KeyError, IndexError):
+            return None
+        return to_grid(parse_board(line))
+
+    def _refill(self):
+        while not self._stop.is_set():
+            missing = [d for d in self.difficulties if len(self.pools[d]) < self.pool_size]
+            if not missing:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            # Top up the emptiest pool first
+            difficulty = min(missing, key=lambda d: len(self.pools[d]))
+            puzzle, _ = self._generate(difficulty)
+            self.pools[difficulty].append("".join(str(value) for row in puzzle for value in row))
+
+    def _generate(self, difficulty: int):
+        if self._executor is not None:
+            try:
+                return self._executor.submit(generate_puzzle, difficulty).result()
+            except (BrokenProcessPool, OSError):
+                self._executor = None
+        return generate_puzzle(difficulty)
@@ -0,0 +1,113 @@
+import numpy as np
+from typing import Optional, Tuple
+
+from .solver import BOX_OF, PEERS, SudokuSolver
+
+
+class SudokuBoard:
+    """Sudoku board state and rules without any pygame window"""
+
+    def __init__(self, board):
+        self.load(board)
+
+    def load(self, board):
+        """Start a new puzzle; the given numbers become the original board"""
+        self.board = np.array(board)
+        self.original_board = self.board.copy()
+        self.update_number_counts()
+
+    @staticmethod
+    def units_of(row: int, col: int) -> Tuple[int, int, int]:
+        """Indices of the row, column and box containing a cell in unit_counts"""
+        return row, 9 + col, 18 + BOX_OF[row * 9 + col]
+
+    def is_valid(self, num: int, pos: Tuple[int, int]) -> bool:
+        row, col = pos
+        # The cell's own number does not count against itself
+        own = 1 if abs(self.board[row][col]) == num else 0
+        for unit in self.units_of(row, col):
+            if self.unit_counts[unit][num] - own > 0:
+                return False
+        return True
+
+    def in_conflict(self, row: int, col: int) -> bool:
+        num = abs(self.board[row][col])
+        if num == 0:
+            return False
+        for unit in self.units_of(row, col):
+            if self.unit_counts[unit][num] > 1:
+                return True
+        return False
+
+    def solve(self) -> bool:
+        solution = SudokuSolver(self.board).solve()
+        if solution is None:
+            return False
+        self.board[:] = solution
+        self.update_number_counts()
+        return True
+
+    def find_empty(self) -> Optional[Tuple[int, int]]:
+        for i in range(9):
+            for j in range(9):
+                if self.board[i][j] == 0:
+                    return (i, j)
+        return None
+
+    def update_number_counts(self):
+        """Recount everything from scratch; single edits keep the counts up to date instead"""
+        self.unit_counts = [[0] * 10 for _ in range(27)]
+        self.number_counts = {i: 9 for i in range(1, 10)}
+        self.filled = 0
+        for i in range(9):
+            for j in range(9):
+                num = abs(self.board[i][j])
+                if num != 0:
+                    self._count(i, j, num, 1)
+        self.conflict_cells = {(i, j) for i in range(9) for j in range(9) if self.in_conflict(i, j)}
+
+    def _count(self, row: int, col: int, num: int, delta: int):
+        for unit in self.units_of(row, col):
+            self.unit_counts[unit][num] += delta
+        self.number_counts[num] -= delta
+        self.filled += delta
+
+    def _refresh_conflicts(self, row: int, col: int, nums):
+        # Only the edited cell and peers holding the old or new number can change state
+        for index in [row * 9 + col] + PEERS[row * 9 + col]:
+            i, j = index // 9, index % 9
+            if (i, j) == (row, col) or abs(self.board[i][j]) in nums:
+                if self.in_conflict(i, j):
+                    self.conflict_cells.add((i, j))
+                else:
+                    self.conflict_cells.discard((i, j))
+
+    def is_original(self, row: int, col: int) -> bool:
+        return self.original_board[row][col] != 0
+
+    def set_number(self, row: int, col: int, num: int) -> bool:
+        """Write a player number into a free cell; returns False for original cells"""
+        if self.is_original(row, col):
+            return False
+        old = abs(self.board[row][col])
+        if old != 0:
+            self._count(row, col, old, -1)
+        self.board[row][col] = num
+        if num != 0:
+            self._count(row, col, num, 1)
+        self._refresh_conflicts(row, col, {old, num} - {0})
+        return True
+
+    def clear_number(self, row: int, col: int) -> bool:
+        return self.set_number(row, col, 0)
+
+    def reset_board(self):
+        self.board = self.original_board.copy()
+        self.update_number_counts()
+
+    def count_mistakes(self) -> Tuple[int, int]:
+        """Return (mistakes, empty cells) for the current board"""
+        return len(self.conflict_cells), 81 - self.filled
+
+    def is_solved(self) -> bool:
+        return self.filled == 81 and not self.conflict_cells
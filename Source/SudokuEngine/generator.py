@@ -0,0 +1,73 @@
+import random
+import time
+from typing import List, Optional, Tuple
+
+from .solver import SudokuSolver, to_grid
+
+# Blank cells per difficulty. One removal pass reliably reaches about 55
+# blanks with a unique solution; much beyond that the generator only finds
+# puzzles by luck and runs into its time limit.
+EASY = 30
+MEDIUM = 45
+HARD = 55
+
+
+def generate_solution(rng: Optional[random.Random] = None) -> List[int]:
+    """Return a random completely filled board as a flat list of 81 ints"""
+    rng = rng or random.Random()
+    board = [[0] * 9 for _ in range(9)]
+
+    # Fill diagonal 3x3 boxes (independent), then let the solver finish the rest
+    for i in range(0, 9, 3):
+        nums = list(range(1, 10))
+        rng.shuffle(nums)
+        for row in range(3):
+            for col in range(3):
+                board[i + row][i + col] = nums.pop()
+
+    return [value for row in SudokuSolver(board).solve() for value in row]
+
+
+def remove_clues(solution: List[int], to_remove: int, rng: random.Random,
+                 deadline: Optional[float] = None) -> List[int]:
+    """Blank up to `to_remove` cells of a solved board while keeping the solution unique"""
+    solver = SudokuSolver(to_grid(solution))
+    cells = list(range(81))
+    rng.shuffle(cells)
+
+    removed = 0
+    for index in cells:
+        if removed >= to_remove or (deadline is not None and time.perf_counter() > deadline):
+            break
+        digit = solver.cells[index]
+        # The same solver is updated in place instead of rebuilt for every removal
+        solver.clear_cell(index)
+        if solver.count_solutions(2) == 1:
+            removed += 1
+        else:
+            solver.set_cell(index, digit)
+
+    return solver.cells[:]
+
+
+def generate_puzzle(to_remove: int, rng: Optional[random.Random] = None,
+                    time_limit: float = 1.0) -> Tuple[List[List[int]], List[List[int]]]:
+    """Return (puzzle, solution) with a unique solution and up to `to_remove` blank cells.
+
+    New solutions are tried until the target is met or `time_limit` seconds have
+    passed; the puzzle with the most blanks found so far is returned.
+    """
+    rng = rng or random.Random()
+    deadline = time.perf_counter() + time_limit
+    best_puzzle, best_solution, best_blanks = None, None, -1
+
+    while True:
+        solution = generate_solution(rng)
+        puzzle = remove_clues(solution, to_remove, rng, deadline)
+        blanks = puzzle.count(0)
+        if blanks > best_blanks:
+            best_puzzle, best_solution, best_blanks = puzzle, solution, blanks
+        if best_blanks >= to_remove or time.perf_counter() > deadline:
+            break
+
+    return to_grid(best_puzzle), to_grid(best_solution)
@@ -0,0 +1,231 @@
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .generator import generate_puzzle
+from .solver import ALL_DIGITS, BIT_COUNT, BIT_TO_DIGIT, BOX_OF, COL_OF, PEERS, ROW_OF, UNITS, parse_board
+
+EASY_GRADE = "Easy"
+MEDIUM_GRADE = "Medium"
+HARD_GRADE = "Hard"
+EXPERT_GRADE = "Expert"
+GRADES = (EASY_GRADE, MEDIUM_GRADE, HARD_GRADE, EXPERT_GRADE)
+
+# Technique name -> (score per use, grade it requires)
+TECHNIQUES = {
+    "naked_single": (1, EASY_GRADE),
+    "hidden_single": (2, EASY_GRADE),
+    "pointing": (5, MEDIUM_GRADE),
+    "naked_pair": (8, MEDIUM_GRADE),
+    "x_wing": (20, HARD_GRADE),
+}
+# Added once when the techniques run out and the rest needs guessing
+EXPERT_SCORE = 100
+
+ROW_UNITS = UNITS[:9]
+COL_UNITS = UNITS[9:18]
+BOX_UNITS = UNITS[18:]
+
+
+def _segments():
+    """Box/line intersections as (cells, rest of the line, rest of the box), with their groupings.
+
+    Returns the segments, the row then column segment ids of each box, and
+    the three segment ids of each row and then each column.
+    """
+    segments, box_groups, line_groups = [], [], [[] for _ in range(18)]
+    for b, box in enumerate(BOX_UNITS):
+        groups = ([], [])
+        for kind, of in enumerate((ROW_OF, COL_OF)):
+            for n in sorted({of[i] for i in box}):
+                line = UNITS[kind * 9 + n]
+                cells = [i for i in box if of[i] == n]
+                groups[kind].append(len(segments))
+                line_groups[kind * 9 + n].append(len(segments))
+                segments.append((cells, [i for i in line if i not in cells], [i for i in box if i not in cells]))
+        box_groups.append(groups)
+    return segments, box_groups, line_groups
+
+
+SEGMENTS, BOX_SEGMENTS, LINE_SEGMENTS = _segments()
+
+
+class TechniqueSolver:
+    """Solves like a person would, using the easiest technique that makes progress"""
+
+    def __init__(self, board):
+        self.cells = parse_board(board)
+        self.used: Dict[str, int] = {name: 0 for name in TECHNIQUES}
+        # Digits already placed in each row, column and box
+        units = [0] * 27
+        for i, value in enumerate(self.cells):
+            if value:
+                bit = 1 << (value - 1)
+                units[ROW_OF[i]] |= bit
+                units[9 + COL_OF[i]] |= bit
+                units[18 + BOX_OF[i]] |= bit
+        self.cands = [0 if value else ALL_DIGITS & ~(units[ROW_OF[i]] | units[9 + COL_OF[i]] | units[18 + BOX_OF[i]])
+                      for i, value in enumerate(self.cells)]
+
+    def _eliminate_peers(self, index: int, bit: int):
+        cands = self.cands
+        for peer in PEERS[index]:
+            cands[peer] &= ~bit
+
+    def place(self, index: int, digit: int):
+        self.cells[index] = digit
+        self.cands[index] = 0
+        self._eliminate_peers(index, 1 << (digit - 1))
+
+    def naked_single(self) -> int:
+        """Place every naked single in one sweep; returns how many were placed"""
+        cands = self.cands
+        placed = 0
+        for i in range(81):
+            mask = cands[i]
+            if mask and BIT_COUNT[mask] == 1:
+                self.place(i, BIT_TO_DIGIT[mask])
+                placed += 1
+        return placed
+
+    def hidden_single(self) -> bool:
+        cands = self.cands
+        for unit in UNITS:
+            once = twice = 0
+            for i in unit:
+                twice |= once & cands[i]
+                once |= cands[i]
+            hidden = once & ~twice
+            if hidden:
+                bit = hidden & -hidden
+                for i in unit:
+                    if cands[i] & bit:
+                        self.place(i, BIT_TO_DIGIT[bit])
+                        return True
+        return False
+
+    def _remove(self, cells, bit: int) -> bool:
+        changed = False
+        cands = self.cands
+        for i in cells:
+            if cands[i] & bit:
+                cands[i] &= ~bit
+                changed = True
+        return changed
+
+    def pointing(self) -> bool:
+        """Locked candidates: a digit confined to one line inside a box, or one box inside a line"""
+        cands = self.cands
+        masks = []
+        for cells, _, _ in SEGMENTS:
+            mask = 0
+            for i in cells:
+                mask |= cands[i]
+            masks.append(mask)
+        # Box first: a digit in one segment of a box leaves the rest of that line
+        for groups, rest in [(group, 1) for box in BOX_SEGMENTS for group in box] + [(group, 2) for group in LINE_SEGMENTS]:
+            a, b, c = (masks[k] for k in groups)
+            for k, confined in zip(groups, (a & ~(b | c), b & ~(a | c), c & ~(a | b))):
+                while confined:
+                    bit = confined & -confined
+                    confined ^= bit
+                    if self._remove(SEGMENTS[k][rest], bit):
+                        return True
+        return False
+
+    def naked_pair(self) -> bool:
+        cands = self.cands
+        for unit in UNITS:
+            seen = {}
+            for i in unit:
+                mask = cands[i]
+                if BIT_COUNT[mask] == 2:
+                    if mask in seen:
+                        pair = (seen[mask], i)
+                        others = [j for j in unit if j not in pair]
+                        changed = False
+                        for bit in (mask & -mask, mask & (mask - 1)):
+                            changed |= self._remove(others, bit)
+                        if changed:
+                            return True
+                    else:
+                        seen[mask] = i
+        return False
+
+    def x_wing(self) -> bool:
+        cands = self.cands
+        for lines, cross in ((ROW_UNITS, COL_UNITS), (COL_UNITS, ROW_UNITS)):
+            # Positions of each digit along each line, as 9-bit masks
+            spots = [[0] * 9 for _ in range(9)]
+            for n, line in enumerate(lines):
+                line_spots = spots[n]
+                for k, i in enumerate(line):
+                    mask = cands[i]
+                    while mask:
+                        bit = mask & -mask
+                        mask ^= bit
+                        line_spots[BIT_TO_DIGIT[bit] - 1] |= 1 << k
+            for d in range(9):
+                bit = 1 << d
+                pairs = {}
+                for n in range(9):
+                    where = spots[n][d]
+                    if BIT_COUNT[where] != 2:
+                        continue
+                    if where in pairs:
+                        wing_lines = (pairs[where], n)
+                        others = [cross[k][m] for k in range(9) if where >> k & 1
+                                  for m in range(9) if m not in wing_lines]
+                        if self._remove(others, bit):
+                            return True
+                    else:
+                        pairs[where] = n
+        return False
+
+    def run(self) -> bool:
+        """Apply techniques until solved or stuck; returns True when solved.
+
+        The harder scans only run once every easier technique has stalled.
+        """
+        steps = [(name, getattr(self, name)) for name in TECHNIQUES]
+        while 0 in self.cells:
+            for name, step in steps:
+                uses = step()
+                if uses:
+                    self.used[name] += uses
+                    break
+            else:
+                return False
+        return True
+
+
+def grade_puzzle(board) -> Tuple[str, int]:
+    """Return (grade, score) for a puzzle based on the techniques it needs"""
+    solver = TechniqueSolver(board)
+    solved = solver.run()
+    score = sum(TECHNIQUES[name][0] * count for name, count in solver.used.items())
+    if not solved:
+        return EXPERT_GRADE, score + EXPERT_SCORE
+
+    grade = EASY_GRADE
+    for name, count in solver.used.items():
+        required = TECHNIQUES[name][1]
+        if count and GRADES.index(required) > GRADES.index(grade):
+            grade = required
+    return grade, score
+
+
+def generate_graded_puzzle(to_remove: int, grade: str, rng: Optional[random.Random] = None,
+                           time_limit: float = 3.0) -> Tuple[List[List[int]], List[List[int]]]:
+    """Generate puzzles until one matches `grade`; on timeout the closest one is returned"""
+    rng = rng or random.Random()
+    deadline = time.perf_counter() + time_limit
+    target = GRADES.index(grade)
+    best, best_distance = None, len(GRADES)
+    while True:
+        puzzle, solution = generate_puzzle(to_remove, rng, time_limit=max(0.05, deadline - time.perf_counter()))
+        distance = abs(GRADES.index(grade_puzzle(puzzle)[0]) - target)
+        if distance < best_distance:
+            best, best_distance = (puzzle, solution), distance
+        if best_distance == 0 or time.perf_counter() > deadline:
+            return best
@@ -0,0 +1,273 @@
+from typing import List, Optional, Sequence, Tuple
+
+ALL_DIGITS = 0x1FF
+
+ROW_OF = [i // 9 for i in range(81)]
+COL_OF = [i % 9 for i in range(81)]
+BOX_OF = [(i // 27) * 3 + (i % 9) // 3 for i in range(81)]
+
+UNITS = (
+    [[r * 9 + c for c in range(9)] for r in range(9)]
+    + [[r * 9 + c for r in range(9)] for c in range(9)]
+    + [[(b // 3) * 27 + (b % 3) * 3 + (k // 3) * 9 + k % 3 for k in range(9)] for b in range(9)]
+)
+
+PEERS = [
+    sorted({j for unit in (UNITS[ROW_OF[i]], UNITS[9 + COL_OF[i]], UNITS[18 + BOX_OF[i]]) for j in unit} - {i})
+    for i in range(81)
+]
+
+CELL_UNITS = [(ROW_OF[i], 9 + COL_OF[i], 18 + BOX_OF[i]) for i in range(81)]
+
+BIT_COUNT = [bin(m).count("1") for m in range(512)]
+BIT_TO_DIGIT = {1 << d: d + 1 for d in range(9)}
+MASK_DIGITS = [[d + 1 for d in range(9) if m & (1 << d)] for m in range(512)]
+# A digit mask spread to one 4-bit counter per digit, so candidate counts add up per unit
+SPREAD = [sum(1 << (4 * d) for d in range(9) if m & (1 << d)) for m in range(512)]
+
+
+def parse_board(board) -> List[int]:
+    """Flatten a 9x9 grid or an 81-character string into a list of 81 ints"""
+    if isinstance(board, str):
+        cells = [int(ch) if ch.isdigit() else 0 for ch in board.strip()]
+    else:
+        cells = [int(abs(value)) for row in board for value in row]
+    if len(cells) != 81 or any(value < 0 or value > 9 for value in cells):
+        raise ValueError("A Sudoku board needs 81 cells with values 0-9")
+    return cells
+
+
+def to_grid(cells: Sequence[int]) -> List[List[int]]:
+    """Turn a flat list of 81 ints into a 9x9 grid"""
+    return [list(cells[r * 9:r * 9 + 9]) for r in range(9)]
+
+
+class SudokuSolver:
+    """Bitmask constraint-propagation solver, independent of pygame"""
+
+    def __init__(self, board):
+        self.cells = [0] * 81
+        self.rows = [0] * 9
+        self.cols = [0] * 9
+        self.boxes = [0] * 9
+        self.conflicts = 0
+        self._trail: List[int] = []
+        self._solution: Optional[List[int]] = None
+        for i, value in enumerate(parse_board(board)):
+            if value:
+                self.set_cell(i, value)
+
+    def candidates(self, index: int) -> int:
+        """Bitmask of digits that can still go into an empty cell"""
+        return ALL_DIGITS & ~(self.rows[ROW_OF[index]] | self.cols[COL_OF[index]] | self.boxes[BOX_OF[index]])
+
+    def candidate_digits(self, row: int, col: int) -> List[int]:
+        index = row * 9 + col
+        if self.cells[index]:
+            return []
+        return MASK_DIGITS[self.candidates(index)]
+
+    def set_cell(self, index: int, digit: int):
+        """Place a given; every peer already holding the digit counts as one conflict"""
+        if self.cells[index]:
+            self.clear_cell(index)
+        self.conflicts += sum(1 for j in PEERS[index] if self.cells[j] == digit)
+        self._assign(index, digit)
+
+    def clear_cell(self, index: int):
+        """Remove a given so the solver state can be reused for the next clue removal"""
+        digit = self.cells[index]
+        if digit:
+            self._unassign(index)
+            # Duplicate givens share unit bits, so restore the ones still in use
+            for j in PEERS[index]:
+                if self.cells[j] == digit:
+                    self.conflicts -= 1
+                    self._assign(j, digit)
+
+    def _assign(self, index: int, digit: int):
+        bit = 1 << (digit - 1)
+        self.cells[index] = digit
+        self.rows[ROW_OF[index]] |= bit
+        self.cols[COL_OF[index]] |= bit
+        self.boxes[BOX_OF[index]] |= bit
+
+    def _unassign(self, index: int):
+        bit = ~(1 << (self.cells[index] - 1))
+        self.cells[index] = 0
+        self.rows[ROW_OF[index]] &= bit
+        self.cols[COL_OF[index]] &= bit
+        self.boxes[BOX_OF[index]] &= bit
+
+    def _undo(self, trail_length: int):
+        trail = self._trail
+        while len(trail) > trail_length:
+            self._unassign(trail.pop())
+
+    def _masks(self) -> Tuple[List[int], List[Tuple[int, int]]]:
+        """Candidate masks of all cells (0 for filled ones) and the naked singles to place first"""
+        rows, cols, boxes, cells = self.rows, self.cols, self.boxes, self.cells
+        masks = [0] * 81
+        queue = []
+        for i in range(81):
+            if not cells[i]:
+                mask = ALL_DIGITS & ~(rows[ROW_OF[i]] | cols[COL_OF[i]] | boxes[BOX_OF[i]])
+                masks[i] = mask
+                if BIT_COUNT[mask] <= 1:
+                    queue.append((i, mask))
+        return masks, queue
+
+    def _propagate(self, masks: List[int], counts: List[int], queue: List[Tuple[int, int]]) -> bool:
+        """Place the queued (cell, digit bit) pairs and every naked and hidden single they lead to.
+
+        `masks` is updated as digits are placed, so a placement only touches
+        its peers. Once naked singles run out, `counts` is filled with the
+        candidate counts per unit, packed four bits per digit (see SPREAD), and
+        kept up to date from then on, so hidden singles show up as counts
+        drop to one instead of by rescanning the board. False on contradiction.
+        """
+        cells, rows, cols, boxes = self.cells, self.rows, self.cols, self.boxes
+        trail = self._trail
+        placed = rows + cols + boxes
+        while True:
+            while queue:
+                i, bit = queue.pop()
+                if cells[i]:
+                    continue
+                mask = masks[i]
+                if not mask & bit:
+                    return False
+                r, c, b = ROW_OF[i], COL_OF[i], BOX_OF[i]
+                cells[i] = BIT_TO_DIGIT[bit]
+                rows[r] |= bit
+                cols[c] |= bit
+                boxes[b] |= bit
+                placed[r] |= bit
+                placed[9 + c] |= bit
+                placed[18 + b] |= bit
+                trail.append(i)
+                masks[i] = 0
+                if counts:
+                    # All of the cell's candidates leave its units
+                    spread = SPREAD[mask]
+                    others = MASK_DIGITS[mask ^ bit]
+                    for u in CELL_UNITS[i]:
+                        count = counts[u] - spread
+                        counts[u] = count
+                        for d in others:
+                            if count >> 4 * (d - 1) & 15 <= 1 and not self._last_place(u, d - 1, masks, counts,
+                                                                                       placed, queue):
+                                return False
+                shift = 4 * (BIT_TO_DIGIT[bit] - 1)
+                one = 1 << shift
+                for j in PEERS[i]:
+                    mask = masks[j]
+                    if mask & bit:
+                        mask ^= bit
+                        masks[j] = mask
+                        if BIT_COUNT[mask] == 1:
+                            queue.append((j, mask))
+                        elif not mask:
+                            return False
+                        if counts:
+                            for u in CELL_UNITS[j]:
+                                count = counts[u] - one
+                                counts[u] = count
+                                if (count >> shift & 15 <= 1 and not placed[u] & bit
+                                        and not self._last_place(u, shift // 4, masks, counts, placed, queue)):
+                                    return False
+            if counts:
+                return True
+
+            # Naked singles ran out: count candidates and look for hidden singles from here on
+            counts[:] = [0] * 27
+            for i in range(81):
+                mask = masks[i]
+                if mask:
+                    spread = SPREAD[mask]
+                    for u in CELL_UNITS[i]:
+                        counts[u] += spread
+            for u in range(27):
+                for d in MASK_DIGITS[ALL_DIGITS & ~placed[u]]:
+                    if counts[u] >> 4 * (d - 1) & 15 <= 1 and not self._last_place(u, d - 1, masks, counts,
+                                                                               placed, queue):
+                        return False
+            if not queue:
+                return True
+
+    @staticmethod
+    def _last_place(u: int, d: int, masks: List[int], counts: List[int], placed: List[int],
+                    queue: List[Tuple[int, int]]) -> bool:
+        """Digit d + 1 has at most one place left in unit u: queue it as a hidden single, False if none is left"""
+        bit = 1 << d
+        if placed[u] & bit:
+            return True
+        if not counts[u] >> 4 * d & 15:
+            return False
+        for i in UNITS[u]:
+            if masks[i] & bit:
+                queue.append((i, bit))
+                break
+        return True
+
+    def _search(self, limit: int, masks: List[int], counts: List[int], queue: List[Tuple[int, int]]) -> int:
+        trail_length = len(self._trail)
+        if not self._propagate(masks, counts, queue):
+            self._undo(trail_length)
+            return 0
+
+        # Minimum remaining values: branch on the cell with the fewest candidates
+        best = -1
+        best_count = 10
+        for i in range(81):
+            mask = masks[i]
+            if mask:
+                count = BIT_COUNT[mask]
+                if count < best_count:
+                    best, best_count = i, count
+                    if count == 2:
+                        break
+
+        if best == -1:
+            if self._solution is None:
+                self._solution = self.cells[:]
+            self._undo(trail_length)
+            return 1
+
+        found = 0
+        mask = masks[best]
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            found += self._search(limit - found, masks[:], counts[:], [(best, bit)])
+            if found >= limit:
+                break
+        self._undo(trail_length)
+        return found
+
+    def solve(self) -> Optional[List[List[int]]]:
+        """Return the first solution as a 9x9 grid, or None if there is none"""
+        if self.count_solutions(1) == 0:
+            return None
+        return to_grid(self._solution)
+
+    def count_solutions(self, limit: int = 2) -> int:
+        """Count solutions, stopping early once `limit` have been found"""
+        self._solution = None
+        if self.conflicts:
+            return 0
+        masks, queue = self._masks()
+        return self._search(limit, masks, [], queue)
+
+    @property
+    def solution(self) -> Optional[List[List[int]]]:
+        return to_grid(self._solution) if self._solution else None
+
+
+def solve(board) -> Optional[List[List[int]]]:
+    """Solve a 9x9 grid or 81-character string"""
+    return SudokuSolver(board).solve()
+
+
+def count_solutions(board, limit: int = 2) -> int:
+    return SudokuSolver(board).count_solutions(limit)
@@ -1,14 +1,44 @@
-import numpy as np
 import tkinter as tk
 from tkinter import font as tkfont
-import copy
-import pickle
+from tkinter import messagebox
+import os
+from TicTacToeEngine import (HumanPlayer, ComputerPlayer, QPlayer, PerfectPlayer, AlphaBetaPlayer, Trainer, QTable,
+                             MetricsLog, new_board)
+import TicTacToeEngine
+
+Q_TABLE_FILE = "Bot_Training.npy"
+# Saved by older versions; converted to Q_TABLE_FILE the first time the bot is played
+LEGACY_Q_TABLE_FILE = "Bot_Training.p"
+# Trained with `python -m TicTacToeEngine network`; needs torch
+NETWORK_FILE = "Bot_Network.pt"
+# One row per 1000 training episodes (see TicTacToeEngine.metrics); .jsonl also works
+TRAINING_LOG_FILE = "Bot_Training_metrics.csv"
+# Chart lines in the training window: metrics column, legend and colour
+TRAINING_CHART_LINES = (
+    ("random_win", "Win vs Random", "#4ecdc4"),
+    ("random_loss", "Loss vs Random", "#ff6b6b"),
+    ("thand_win", "Win vs THand", "#ffd93d"),
+    ("thand_loss", "Loss vs THand", "#e17055"),
+)
+
+# Menu name -> (rows, columns, marks in a row to win); only 3x3 has the trained and perfect bots
+BOARD_VARIANTS = {
+    "3×3": (3, 3, 3),
+    "5×5, 4 in a row": (5, 5, 4),
+    "7×7, 5 in a row": (7, 7, 5),
+    "15×15 Gomoku": (15, 15, 5),
+}
+CLASSIC = "3×3"
 
 class Game:
-    def __init__(self, master, player1, player2, Q_learn=None, Q={}, alpha=0.3, gamma=0.9):
+    def __init__(self, master, player1, player2, Q_learn=None, Q={}, alpha=0.3, gamma=0.9, rows=3, cols=3, k=3):
         self.master = master
+        self.rows = rows
+        self.cols = cols
+        self.k = k
         master.title("Tic Tac Toe")
-        master.geometry("500x650")
+        if (rows, cols) == (3, 3):
+            master.geometry("500x650")
         master.configure(bg="#1e1e2e")
         master.resizable(False, False)
 
@@ -17,7 +47,7 @@ class Game:
         self.current_player = player1
         self.other_player = player2
         self.empty_text = ""
-        self.board = Board()
+        self.board = new_board(rows, cols, k)
         self.x_score = 0
         self.o_score = 0
 
@@ -33,15 +63,18 @@ class Game:
     def create_widgets(self):
         title_font = tkfont.Font(family="Segoe UI", size=32, weight="bold")
         label_font = tkfont.Font(family="Segoe UI", size=14)
-        button_font = tkfont.Font(family="Segoe UI", size=28, weight="bold")
+        cells = max(self.rows, self.cols)
+        button_font = tkfont.Font(family="Segoe UI", size=max(10, 84 // cells), weight="bold")
+        button_width, button_height, button_pad = (5, 2, 4) if cells <= 5 else (2, 1, 1)
         reset_font = tkfont.Font(family="Segoe UI", size=12, weight="bold")
 
         header_frame = tk.Frame(self.master, bg="#1e1e2e")
         header_frame.pack(pady=20)
 
+        title = "Tic Tac Toe" if (self.rows, self.cols, self.k) == (3, 3, 3) else f"{self.k} in a Row"
         title_label = tk.Label(
             header_frame,
-            text="Tic Tac Toe",
+            text=title,
             font=title_font,
             bg="#1e1e2e",
             fg="#ffffff"
@@ -81,13 +114,13 @@ class Game:
         board_frame = tk.Frame(self.master, bg="#1e1e2e", padx=20)
         board_frame.pack(pady=10)
 
-        self.buttons = [[None for _ in range(3)] for _ in range(3)]
-        for i in range(3):
-            for j in range(3):
+        self.buttons = [[None for _ in range(self.cols)] for _ in range(self.rows)]
+        for i in range(self.rows):
+            for j in range(self.cols):
                 self.buttons[i][j] = tk.Button(
                     board_frame,
-                    height=2,
-                    width=5,
+                    height=button_height,
+                    width=button_width,
                     text=self.empty_text,
                     font=button_font,
                     bg="#2d2d44",
@@ -97,7 +130,7 @@ class Game:
                     cursor="hand2",
                     command=lambda i=i, j=j: self.callback(self.buttons[i][j])
                 )
-                self.buttons[i][j].grid(row=i, column=j, padx=4, pady=4)
+                self.buttons[i][j].grid(row=i, column=j, padx=button_pad, pady=button_pad)
 
         buttons_frame = tk.Frame(self.master, bg="#1e1e2e")
         buttons_frame.pack(pady=20)
@@ -209,44 +242,14 @@ class Game:
             self.status_label.config(text=f"Player {self.current_player.mark}'s Turn")
 
     def highlight_winner(self):
-        winner = self.board.winner()
-        if winner:
-            rows = [self.board.grid[i,:] for i in range(3)]
-            cols = [self.board.grid[:,j] for j in range(3)]
-            diag = [np.array([self.board.grid[i,i] for i in range(3)])]
-            cross_diag = [np.array([self.board.grid[2-i,i] for i in range(3)])]
-            lanes = np.concatenate((rows, cols, diag, cross_diag))
-
-            target = 1 if winner == "X" else 0
-            for i in range(3):
-                if np.array_equal(rows[i], np.full(3, target)):
-                    self.highlight_row(i, True)
-                if np.array_equal(cols[i], np.full(3, target)):
-                    self.highlight_row(i, False)
-            if np.array_equal(diag[0], np.full(3, target)):
-                self.highlight_diagonal(True)
-            if np.array_equal(cross_diag[0], np.full(3, target)):
-                self.highlight_diagonal(False)
-
-    def highlight_row(self, index, is_row):
-        for i in range(3):
-            if is_row:
-                self.buttons[index][i].config(bg="#ffd93d", fg="#1e1e2e")
-            else:
-                self.buttons[i][index].config(bg="#ffd93d", fg="#1e1e2e")
-
-    def highlight_diagonal(self, is_main):
-        for i in range(3):
-            if is_main:
-                self.buttons[i][i].config(bg="#ffd93d", fg="#1e1e2e")
-            else:
-                self.buttons[2-i][i].config(bg="#ffd93d", fg="#1e1e2e")
+        for i, j in self.board.winning_cells():
+            self.buttons[i][j].config(bg="#ffd93d", fg="#1e1e2e")
 
     def reset(self, suppress_output=False):
-        for i in range(3):
-            for j in range(3):
+        for i in range(self.rows):
+            for j in range(self.cols):
                 self.buttons[i][j].configure(text=self.empty_text, bg="#2d2d44", fg="#ffffff")
-        self.board = Board(grid=np.ones((3, 3)) * np.nan)
+        self.board = new_board(self.rows, self.cols, self.k)
         self.current_player = self.player1
         self.other_player = self.player2
         self.status_label.config(text="Player X's Turn", fg="#a0a0a0")
@@ -276,163 +279,14 @@ class Game:
         self.handle_move(move)
 
     def learn_Q(self, move):
-        state_key = QPlayer.make_and_maybe_add_key(self.board, self.current_player.mark, self.Q)
-        next_board = self.board.get_next_board(move, self.current_player.mark)
-        reward = next_board.give_reward()
-        next_state_key = QPlayer.make_and_maybe_add_key(next_board, self.other_player.mark, self.Q)
-        if next_board.over():
-            expected = reward
-        else:
-            next_Qs = self.Q[next_state_key]
-            if self.current_player.mark == "X":
-                expected = reward + (self.gamma * min(next_Qs.values()))
-            elif self.current_player.mark == "O":
-                expected = reward + (self.gamma * max(next_Qs.values()))
-        change = self.alpha * (expected - self.Q[state_key][move])
-        self.Q[state_key][move] += change
-
-
-class Board:
-    def __init__(self, grid=np.ones((3,3))*np.nan):
-        self.grid = grid
-
-    def winner(self):
-        rows = [self.grid[i,:] for i in range(3)]
-        cols = [self.grid[:,j] for j in range(3)]
-        diag = [np.array([self.grid[i,i] for i in range(3)])]
-        cross_diag = [np.array([self.grid[2-i,i] for i in range(3)])]
-        lanes = np.concatenate((rows, cols, diag, cross_diag))
-
-        any_lane = lambda x: any([np.array_equal(lane, x) for lane in lanes])
-        if any_lane(np.ones(3)):
-            return "X"
-        elif any_lane(np.zeros(3)):
-            return "O"
-
-    def over(self):
-        return (not np.any(np.isnan(self.grid))) or (self.winner() is not None)
-
-    def place_mark(self, move, mark):
-        num = Board.mark2num(mark)
-        self.grid[tuple(move)] = num
-
-    @staticmethod
-    def mark2num(mark):
-        d = {"X": 1, "O": 0}
-        return d[mark]
-
-    def available_moves(self):
-        return [(i,j) for i in range(3) for j in range(3) if np.isnan(self.grid[i][j])]
-
-    def get_next_board(self, move, mark):
-        next_board = copy.deepcopy(self)
-        next_board.place_mark(move, mark)
-        return next_board
-
-    def make_key(self, mark):
-        fill_value = 9
-        filled_grid = copy.deepcopy(self.grid)
-        np.place(filled_grid, np.isnan(filled_grid), fill_value)
-        return "".join(map(str, (list(map(int, filled_grid.flatten()))))) + mark
-
-    def give_reward(self):
-        if self.over():
-            if self.winner() is not None:
-                if self.winner() == "X":
-                    return 1.0
-                elif self.winner() == "O":
-                    return -1.0
-            else:
-                return 0.5
-        return 0.0
-
-
-class Player(object):
-    def __init__(self, mark):
-        self.mark = mark
-
-    @property
-    def opponent_mark(self):
-        if self.mark == 'X':
-            return 'O'
-        elif self.mark == 'O':
-            return 'X'
-        else:
-            print("The player's mark must be either 'X' or 'O'.")
-
-class HumanPlayer(Player):
-    pass
-
-class ComputerPlayer(Player):
-    pass
-
-class RandomPlayer(ComputerPlayer):
-    @staticmethod
-    def get_move(board):
-        moves = board.available_moves()
-        if moves:
-            return moves[np.random.choice(len(moves))]
-
-class THandPlayer(ComputerPlayer):
-    def __init__(self, mark):
-        super(THandPlayer, self).__init__(mark=mark)
-
-    def get_move(self, board):
-        moves = board.available_moves()
-        if moves:
-            for move in moves:
-                if THandPlayer.next_move_winner(board, move, self.mark):
-                    return move
-                elif THandPlayer.next_move_winner(board, move, self.opponent_mark):
-                    return move
-            else:
-                return RandomPlayer.get_move(board)
-
-    @staticmethod
-    def next_move_winner(board, move, mark):
-        return board.get_next_board(move, mark).winner() == mark
+        TicTacToeEngine.learn_Q(self.Q, self.board, move, self.current_player.mark, self.other_player.mark,
+                                self.alpha, self.gamma)
 
 
-class QPlayer(ComputerPlayer):
-    def __init__(self, mark, Q={}, epsilon=0.2):
-        super(QPlayer, self).__init__(mark=mark)
-        self.Q = Q
-        self.epsilon = epsilon
-
-    def get_move(self, board):
-        if np.random.uniform() < self.epsilon:
-            return RandomPlayer.get_move(board)
-        else:
-            state_key = QPlayer.make_and_maybe_add_key(board, self.mark, self.Q)
-            Qs = self.Q[state_key]
-            if self.mark == "X":
-                return QPlayer.stochastic_argminmax(Qs, max)
-            elif self.mark == "O":
-                return QPlayer.stochastic_argminmax(Qs, min)
-
-    @staticmethod
-    def make_and_maybe_add_key(board, mark, Q):
-        default_Qvalue = 1.0
-        state_key = board.make_key(mark)
-        if state_key not in Q:
-            moves = board.available_moves()
-            Q[state_key] = {move: default_Qvalue for move in moves}
-        return state_key
-
-    @staticmethod
-    def stochastic_argminmax(Qs, min_or_max):
-        min_or_maxQ = min_or_max(list(Qs.values()))
-        if list(Qs.values()).count(min_or_maxQ) > 1:
-            best_options = [move for move in list(Qs.keys()) if Qs[move] == min_or_maxQ]
-            move = best_options[np.random.choice(len(best_options))]
-        else:
-            move = min_or_max(Qs, key=Qs.get)
-        return move
-
 def train_QPlayer():
     root = tk.Tk()
     root.title("Tic Tac Toe Training")
-    root.geometry("400x450")
+    root.geometry("520x720")
     root.configure(bg="#1e1e2e")
     root.resizable(False, False)
 
@@ -487,27 +341,64 @@ def train_QPlayer():
         progress_label.config(text="Training in progress...")
         start_button.config(state="disabled", bg="#636e72")
 
-        def train():
-            epsilon = 0.9
-            player1 = QPlayer(mark="X", epsilon=epsilon)
-            player2 = QPlayer(mark="O", epsilon=epsilon)
-            game = Game(root, player1, player2)
+        # Training runs in worker processes; the window only polls the progress
+        trainer = Trainer(N_episodes, jobs=os.cpu_count() or 1, epsilon=0.9, eval_games=100,
+                          log=MetricsLog(TRAINING_LOG_FILE))
+        trainers.append(trainer)
+        trainer.start()
+        root.after(100, poll_training, trainer)
+
+    def draw_chart(rows):
+        chart.delete("all")
+        width, height, margin = int(chart["width"]), int(chart["height"]), 30
+        chart.create_rectangle(margin, 10, width - 10, height - margin, outline="#636e72")
+        for rate in (0.0, 0.5, 1.0):
+            y = height - margin - rate * (height - margin - 10)
+            chart.create_text(margin - 4, y, text=f"{rate:.1f}", anchor="e", fill="#a0a0a0")
+        for n, (_, name, colour) in enumerate(TRAINING_CHART_LINES):
+            chart.create_text(margin + 5 + n * 115, height - 12, text=name, anchor="w", fill=colour)
+        if not rows:
+            return
+        last = rows[-1]["episodes"] or 1
+        for column, _, colour in TRAINING_CHART_LINES:
+            points = []
+            for row in rows:
+                points.append(margin + row["episodes"] / last * (width - 10 - margin))
+                points.append(height - margin - row[column] * (height - margin - 10))
+            if len(points) >= 4:
+                chart.create_line(*points, fill=colour, width=2)
+        stats_label.config(text=f"Episodes: {last}   Q states: {rows[-1]['q_states']}   "
+                                f"mean |ΔQ|: {rows[-1]['mean_abs_dq']:.4f}   "
+                                f"{rows[-1]['episodes_per_second']:.0f} episodes/s")
+
+    def poll_training(trainer):
+        draw_chart(trainer.stats)
+        if not trainer.done:
+            progress_label.config(text=f"Training: {int(trainer.progress * 100)}%")
+            root.after(100, poll_training, trainer)
+            return
+        trainer.log.close()
+        if trainer.error is not None:
+            progress_label.config(text="Training failed", fg="#ff6b6b")
+            error_label.config(text=f"Error: {trainer.error}")
+            start_button.config(state="normal", bg="#6c5ce7")
+            return
 
-            for episodes in range(N_episodes):
-                game.play()
-                game.reset(suppress_output=True)
-                if episodes % 1000 == 0 and episodes > 0:
-                    progress = int((episodes / N_episodes) * 100)
-                    progress_label.config(text=f"Training: {progress}%")
+        QTable.from_dict(trainer.Q).save(Q_TABLE_FILE)
 
-            Q = game.Q
-            filename = f"Bot_Training.p"
-            pickle.dump(Q, open(filename, "wb"))
+        progress_label.config(text="Training Complete!", fg="#4ecdc4")
+        root.after(2000, lambda: [root.destroy(), main_menu()])
 
-            progress_label.config(text="Training Complete!", fg="#4ecdc4")
-            root.after(2000, lambda: [root.destroy(), main_menu()])
+    def go_back():
+        for trainer in trainers:
+            trainer.stop()
+            # The training thread may still be writing a row; let it finish first
+            trainer.join()
+            trainer.log.close()
+        root.destroy()
+        main_menu()
 
-        root.after(100, train)
+    trainers = []
 
     start_button = tk.Button(
         root,
@@ -528,6 +419,12 @@ def train_QPlayer():
     progress_label = tk.Label(root, text="", font=label_font, bg="#1e1e2e", fg="#a0a0a0")
     progress_label.pack(pady=10)
 
+    chart = tk.Canvas(root, width=480, height=220, bg="#2d2d44", highlightthickness=0)
+    chart.pack(pady=5)
+    stats_label = tk.Label(root, text="", font=tkfont.Font(family="Segoe UI", size=10), bg="#1e1e2e", fg="#a0a0a0")
+    stats_label.pack(pady=5)
+    draw_chart([])
+
     back_button = tk.Button(
         root,
         text="Back",
@@ -538,7 +435,7 @@ def train_QPlayer():
         activeforeground="#ffffff",
         relief="flat",
         cursor="hand2",
-        command=lambda: [root.destroy(), main_menu()],
+        command=go_back,
         padx=20,
         pady=8
     )
@@ -546,18 +443,35 @@ def train_QPlayer():
 
     root.mainloop()
 
-def play_human_vs_QPlayer():
+def load_legacy_Q(root):
+    """Convert Bot_Training.p from an older version, or start untrained if there is none"""
+    if not os.path.exists(LEGACY_Q_TABLE_FILE):
+        return QTable()
     try:
-        with open("Bot_Training.p", "rb") as file:
-            Q = pickle.load(file)
-    except (FileNotFoundError, pickle.UnpicklingError):
-        Q = {}
-        with open("Bot_Training.p", "wb") as file:
-            pickle.dump(Q, file)
+        Q = QTable.from_legacy(LEGACY_Q_TABLE_FILE)
+        Q.save(Q_TABLE_FILE)
+    except Exception as e:
+        messagebox.showwarning("Old training file",
+                               f"{LEGACY_Q_TABLE_FILE} could not be converted ({e}).\n"
+                               "The bot will play untrained until it is trained again.", parent=root)
+        return QTable()
+    messagebox.showinfo("Training converted",
+                        f"{LEGACY_Q_TABLE_FILE} was converted to {Q_TABLE_FILE}.", parent=root)
+    return Q
+
+def play_human_vs_QPlayer(variant=CLASSIC):
+    if variant != CLASSIC:
+        play_human_vs_AlphaBetaPlayer(variant)
+        return
 
     root = tk.Tk()
     root.configure(bg="#1e1e2e")
 
+    try:
+        Q = QTable.load(Q_TABLE_FILE)
+    except (FileNotFoundError, ValueError):
+        Q = load_legacy_Q(root)
+
     player1 = HumanPlayer(mark="X")
     player2 = QPlayer(mark="O", epsilon=0)
 
@@ -571,21 +485,69 @@ def play_human_vs_QPlayer():
 
     root.mainloop()
 
-def play_human_vs_human():
+def play_human_vs_PerfectPlayer():
     root = tk.Tk()
     root.configure(bg="#1e1e2e")
 
     player1 = HumanPlayer(mark="X")
-    player2 = HumanPlayer(mark="O")
+    player2 = PerfectPlayer(mark="O")
+
+    game = Game(root, player1, player2)
+    game.play()
+    root.mainloop()
+
+def play_human_vs_NetworkPlayer():
+    # torch is imported and the network loaded only when this game is started
+    try:
+        from TicTacToeEngine.neural import NetworkPlayer, load_network
+        network = load_network(NETWORK_FILE)
+    except (ImportError, OSError, RuntimeError, ValueError) as e:
+        root = tk.Tk()
+        root.withdraw()
+        messagebox.showerror("Neural AI", f"Cannot load {NETWORK_FILE}: {e}\n\n"
+                                          "Train it with: python -m TicTacToeEngine network")
+        root.destroy()
+        main_menu()
+        return
+
+    root = tk.Tk()
+    root.configure(bg="#1e1e2e")
+
+    player1 = HumanPlayer(mark="X")
+    player2 = NetworkPlayer(mark="O", network=network)
 
     game = Game(root, player1, player2)
     game.play()
     root.mainloop()
 
+def play_human_vs_AlphaBetaPlayer(variant):
+    rows, cols, k = BOARD_VARIANTS[variant]
+    root = tk.Tk()
+    root.configure(bg="#1e1e2e")
+
+    player1 = HumanPlayer(mark="X")
+    player2 = AlphaBetaPlayer(mark="O", time_budget=1.0)
+
+    game = Game(root, player1, player2, rows=rows, cols=cols, k=k)
+    game.play()
+    root.mainloop()
+
+def play_human_vs_human(variant=CLASSIC):
+    rows, cols, k = BOARD_VARIANTS[variant]
+    root = tk.Tk()
+    root.configure(bg="#1e1e2e")
+
+    player1 = HumanPlayer(mark="X")
+    player2 = HumanPlayer(mark="O")
+
+    game = Game(root, player1, player2, rows=rows, cols=cols, k=k)
+    game.play()
+    root.mainloop()
+
 def main_menu():
     root = tk.Tk()
     root.title("Tic Tac Toe")
-    root.geometry("450x500")
+    root.geometry("450x720")
     root.configure(bg="#1e1e2e")
     root.resizable(False, False)
 
@@ -599,7 +561,27 @@ def main_menu():
         bg="#1e1e2e",
         fg="#ffffff"
     )
-    title_label.pack(pady=50)
+    title_label.pack(pady=(50, 10))
+
+    def launch(play):
+        choice = variant.get()
+        root.destroy()
+        play(choice)
+
+    def update_buttons():
+        # The trained and perfect bots only know the 3x3 board
+        state = "normal" if variant.get() == CLASSIC else "disabled"
+        play_perfect_button.config(state=state)
+        play_network_button.config(state=state)
+        train_button.config(state=state)
+
+    variant_frame = tk.Frame(root, bg="#1e1e2e")
+    variant_frame.pack()
+    tk.Label(variant_frame, text="Board:", font=button_font, bg="#1e1e2e", fg="#a0a0a0").pack(side=tk.LEFT, padx=5)
+    variant = tk.StringVar(value=CLASSIC)
+    variant_menu = tk.OptionMenu(variant_frame, variant, *BOARD_VARIANTS, command=lambda _: update_buttons())
+    variant_menu.config(bg="#2d2d44", fg="#ffffff", activebackground="#3d3d5c", highlightthickness=0, relief="flat")
+    variant_menu.pack(side=tk.LEFT)
 
     buttons_frame = tk.Frame(root, bg="#1e1e2e")
     buttons_frame.pack(pady=20)
@@ -616,7 +598,7 @@ def main_menu():
         cursor="hand2",
         width=20,
         pady=15,
-        command=lambda: [root.destroy(), play_human_vs_human()]
+        command=lambda: launch(play_human_vs_human)
     )
     play_human_button.pack(pady=10)
 
@@ -632,10 +614,42 @@ def main_menu():
         cursor="hand2",
         width=20,
         pady=15,
-        command=lambda: [root.destroy(), play_human_vs_QPlayer()]
+        command=lambda: launch(play_human_vs_QPlayer)
     )
     play_bot_button.pack(pady=10)
 
+    play_perfect_button = tk.Button(
+        buttons_frame,
+        text="🧠 Play vs Perfect AI",
+        font=button_font,
+        bg="#0984e3",
+        fg="#ffffff",
+        activebackground="#0873c4",
+        activeforeground="#ffffff",
+        relief="flat",
+        cursor="hand2",
+        width=20,
+        pady=15,
+        command=lambda: [root.destroy(), play_human_vs_PerfectPlayer()]
+    )
+    play_perfect_button.pack(pady=10)
+
+    play_network_button = tk.Button(
+        buttons_frame,
+        text="🧩 Play vs Neural AI",
+        font=button_font,
+        bg="#a29bfe",
+        fg="#ffffff",
+        activebackground="#8c84f0",
+        activeforeground="#ffffff",
+        relief="flat",
+        cursor="hand2",
+        width=20,
+        pady=15,
+        command=lambda: [root.destroy(), play_human_vs_NetworkPlayer()]
+    )
+    play_network_button.pack(pady=10)
+
     train_button = tk.Button(
         buttons_frame,
         text="🎓 Train AI",
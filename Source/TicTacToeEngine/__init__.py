@@ -0,0 +1,9 @@
+from .board import Board, Move, SIZE, FULL, MOVE_BITS, WIN_LINES
+from .players import Player, HumanPlayer, ComputerPlayer, RandomPlayer, THandPlayer, QPlayer, PerfectPlayer
+from .training import learn_Q, play_episode, train, merge_Q, Trainer
+from .qtable import QTable, canonical, legacy_key, reachable_states
+from .solver import solve
+from .mnk import MNKBoard, new_board
+from .search import AlphaBetaPlayer
+from .batch import BatchEnv, epsilon_greedy, train_batch
+from .metrics import MetricsLog, WindowStats, evaluate_player, evaluate_Q
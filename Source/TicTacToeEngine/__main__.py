@@ -0,0 +1,95 @@
+"""Headless Tic Tac Toe training.
+
+Usage (from the Source folder):
+    python -m TicTacToeEngine q --episodes 100000 --log Bot_Training_metrics.csv
+    python -m TicTacToeEngine network --games 50000
+"""
+import argparse
+import os
+import sys
+import time
+
+from .metrics import MetricsLog, evaluate_player
+from .players import RandomPlayer, THandPlayer
+from .qtable import QTable
+from .training import Trainer
+
+
+def train_q(args) -> int:
+    with MetricsLog(args.log) as log:
+        trainer = Trainer(args.episodes, jobs=args.jobs, epsilon=args.epsilon, alpha=args.alpha,
+                          gamma=args.gamma, seed=args.seed, eval_games=args.eval_games, log=log)
+        trainer.start()
+        while not trainer.done:
+            trainer.join(1.0)
+            print(f"\r{trainer.episodes_done}/{args.episodes} episodes", end="", flush=True)
+        print()
+    if trainer.error is not None:
+        print(f"Training failed: {trainer.error}", file=sys.stderr)
+        return 1
+    QTable.from_dict(trainer.Q).save(args.out)
+    if trainer.stats:
+        last = trainer.stats[-1]
+        print(f"vs Random: {last['random_win']:.0%} won, {last['random_loss']:.0%} lost; "
+              f"vs THand: {last['thand_win']:.0%} won, {last['thand_loss']:.0%} lost")
+    print(f"Saved {args.out}")
+    return 0
+
+
+def train_net(args) -> int:
+    # torch is only needed for this command
+    try:
+        from .neural import NetworkPlayer, export, load_network, move_time, train_network
+    except ImportError as e:
+        print(f"The network bot needs torch ({e})", file=sys.stderr)
+        return 1
+
+    def report(played, loss):
+        print(f"\r{played}/{args.games} games, loss {loss:.4f}", end="", flush=True)
+
+    start = time.perf_counter()
+    model = train_network(args.games, args.batch_games, epsilon=args.epsilon, lr=args.lr, seed=args.seed,
+                          on_progress=report)
+    print(f"\nTrained in {time.perf_counter() - start:.1f} s")
+    export(model, args.out)
+    network = load_network(args.out)
+    for name, opponent_class in (("Random", RandomPlayer), ("THand", THandPlayer)):
+        rates = evaluate_player(lambda mark: NetworkPlayer(mark, network), opponent_class, args.eval_games)
+        print(f"vs {name}: {rates['win']:.0%} won, {rates['draw']:.0%} drawn, {rates['loss']:.0%} lost")
+    print(f"{move_time(network) * 1e6:.0f} µs per move")
+    print(f"Saved {args.out}")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m TicTacToeEngine", description="Train Tic Tac Toe bots without a window")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    q = commands.add_parser("q", help="train the Q-learning bot (Bot_Training.npy)")
+    q.add_argument("--episodes", type=int, default=100000)
+    q.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="worker processes")
+    q.add_argument("--epsilon", type=float, default=0.9)
+    q.add_argument("--alpha", type=float, default=0.3)
+    q.add_argument("--gamma", type=float, default=0.9)
+    q.add_argument("--seed", type=int, default=None)
+    q.add_argument("--eval-games", type=int, default=100, help="games per opponent after every 1000 episodes")
+    q.add_argument("--log", default=None, help="write metrics to this .csv or .jsonl file")
+    q.add_argument("--out", default="Bot_Training.npy")
+    q.set_defaults(run=train_q)
+
+    net = commands.add_parser("network", help="train the neural network bot (needs torch)")
+    net.add_argument("--games", type=int, default=50000)
+    net.add_argument("--batch-games", type=int, default=500, help="self-play games per training batch")
+    net.add_argument("--epsilon", type=float, default=0.3)
+    net.add_argument("--lr", type=float, default=1e-3)
+    net.add_argument("--seed", type=int, default=None)
+    net.add_argument("--eval-games", type=int, default=200)
+    net.add_argument("--out", default="Bot_Network.pt")
+    net.set_defaults(run=train_net)
+
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""Many Tic Tac Toe games stepped at once as NumPy arrays.
+
+BatchEnv holds n games: the board tensor (n, 3, 3) with 1 for X, -1 for O
+and 0 for empty, the cells as the same 9-bit masks Board uses, whose turn
+it is and whether each game is done. step() plays one move in every
+unfinished game and returns the rewards of Board.give_reward(). The
+policy and the Q-learning update work on whole batches through the
+array-backed QTable, so a training step costs a few array operations
+instead of one Python loop per game.
+"""
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from .board import FULL, IS_WIN, SIZE
+from .qtable import CELLS, SYMMETRY_ARRAY, QTable
+
+_IS_WIN = np.array(IS_WIN)
+_CELL_BITS = 1 << np.arange(CELLS)
+
+
+class BatchEnv:
+    """n games of Tic Tac Toe, X to move first in each"""
+
+    def __init__(self, n_games: int):
+        self.n_games = n_games
+        self.cells = np.zeros((n_games, CELLS), dtype=np.int8)
+        self.x = np.zeros(n_games, dtype=np.int64)
+        self.o = np.zeros(n_games, dtype=np.int64)
+        # 1 when X is to move, -1 when O is
+        self.turn = np.ones(n_games, dtype=np.int8)
+        self.done = np.zeros(n_games, dtype=bool)
+
+    @property
+    def boards(self) -> np.ndarray:
+        return self.cells.reshape(self.n_games, SIZE, SIZE)
+
+    def reset(self, games: Optional[np.ndarray] = None) -> np.ndarray:
+        """Start new games: all of them, or those selected by an index or boolean array"""
+        if games is None:
+            games = slice(None)
+        self.cells[games] = 0
+        self.x[games] = 0
+        self.o[games] = 0
+        self.turn[games] = 1
+        self.done[games] = False
+        return self.boards
+
+    def legal_mask(self) -> np.ndarray:
+        """(n, 9) booleans for the empty cells; all False in finished games"""
+        return ((self.x | self.o)[:, None] & _CELL_BITS == 0) & ~self.done[:, None]
+
+    def state_keys(self) -> np.ndarray:
+        """Board.make_key() for every game, with the mark to move"""
+        return (self.x << 10) | (self.o << 1) | (self.turn == -1)
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Play one cell index (row * 3 + column) in every unfinished game.
+
+        Actions for finished games are ignored. Returns the board tensor, the
+        reward of each game as give_reward() scores it (1 X win, -1 O win,
+        0.5 draw, 0 otherwise) and which games are done.
+        """
+        actions = np.asarray(actions)
+        playing = ~self.done
+        bits = np.where(playing, 1 << actions.astype(np.int64), 0)
+        if np.any((self.x | self.o) & bits):
+            raise ValueError("A move was played on a taken cell")
+        games = np.flatnonzero(playing)
+        self.cells[games, actions[games]] = self.turn[games]
+        x_moves = self.turn == 1
+        self.x |= np.where(x_moves, bits, 0)
+        self.o |= np.where(x_moves, 0, bits)
+
+        x_won = _IS_WIN[self.x]
+        o_won = _IS_WIN[self.o]
+        full = (self.x | self.o) == FULL
+        reward = np.select([x_won, o_won, full], [1.0, -1.0, 0.5], 0.0)
+        reward[~playing] = 0.0
+        self.done = x_won | o_won | full
+        self.turn[playing] = -self.turn[playing]
+        return self.boards, reward, self.done.copy()
+
+
+def epsilon_greedy(table: QTable, epsilon: float, rng: np.random.Generator) -> Callable[[BatchEnv], np.ndarray]:
+    """QPlayer.get_move() for a whole batch: X takes the highest Q-value, O the lowest.
+
+    With probability epsilon a game gets a random legal move instead; ties
+    are broken at random like QPlayer.stochastic_argminmax().
+    """
+    def choose(env: BatchEnv) -> np.ndarray:
+        legal = env.legal_mask()
+        actions = np.zeros(env.n_games, dtype=np.intp)
+        playing = np.flatnonzero(~env.done)
+        if not len(playing):
+            return actions
+        legal = legal[playing]
+        noise = rng.random(legal.shape)
+        explore = rng.random(len(playing)) < epsilon
+        greedy = np.flatnonzero(~explore)
+
+        choice = np.argmax(np.where(legal, noise, -1.0), axis=1)
+        if len(greedy):
+            q = _q_values(table, env.state_keys()[playing[greedy]])
+            # Score so that higher is better for the mover
+            q = q * env.turn[playing[greedy], None]
+            q = np.where(legal[greedy], q, -np.inf)
+            best = q == q.max(axis=1, keepdims=True)
+            choice[greedy] = np.argmax(np.where(best, noise[greedy], -1.0), axis=1)
+        actions[playing] = choice
+        return actions
+    return choose
+
+
+def _q_values(table: QTable, state_keys: np.ndarray) -> np.ndarray:
+    """(n, 9) Q-values in board cell order (NaN for taken cells)"""
+    rows, symmetries = table.locate_many(state_keys)
+    return table.values[rows[:, None], SYMMETRY_ARRAY[symmetries]]
+
+
+def train_batch(episodes: int, batch_size: int = 1024, epsilon: float = 0.9, alpha: float = 0.3,
+                gamma: float = 0.9, table: Optional[QTable] = None, seed: Optional[int] = None,
+                on_progress: Optional[Callable[[int], None]] = None) -> QTable:
+    """Self-play Q-learning like train(), with batch_size games played side by side.
+
+    Every move is learned with the update of learn_Q(). When several games in
+    a step play the same move from the same position, it is updated once,
+    towards the mean of their targets.
+    Finished games are restarted until `episodes` games have been played;
+    on_progress(episodes_done) is called after every step that finishes one.
+    """
+    table = QTable() if table is None else table
+    rng = np.random.default_rng(seed)
+    env = BatchEnv(min(batch_size, episodes))
+    policy = epsilon_greedy(table, epsilon, rng)
+    values = table.values
+    started = env.n_games
+    finished = 0
+
+    while finished < episodes:
+        games = np.flatnonzero(~env.done)
+        rows, symmetries = table.locate_many(env.state_keys()[games])
+        actions = policy(env)
+        cells = SYMMETRY_ARRAY[symmetries, actions[games]]
+        movers = env.turn[games].copy()
+
+        _, reward, done = env.step(actions)
+        expected = reward[games].astype(np.float64)
+        going = np.flatnonzero(~done[games])
+        if len(going):
+            next_q = _q_values(table, env.state_keys()[games[going]])
+            # The next mover is the opponent: O minimises after X, X maximises after O
+            best_next = np.where(movers[going] == 1, np.nanmin(next_q, axis=1), np.nanmax(next_q, axis=1))
+            expected[going] += gamma * best_next
+        # One update per (position, move) towards the mean target of the games that played it
+        slots = rows * CELLS + cells
+        totals = np.bincount(slots, weights=expected, minlength=values.size)
+        counts = np.bincount(slots, minlength=values.size)
+        hit = np.flatnonzero(counts)
+        hit_rows, hit_cells = np.divmod(hit, CELLS)
+        values[hit_rows, hit_cells] += alpha * (totals[hit] / counts[hit] - values[hit_rows, hit_cells])
+
+        ended = games[done[games]]
+        if len(ended):
+            finished += len(ended)
+            restart = ended[:max(0, episodes - started)]
+            started += len(restart)
+            env.reset(restart)
+            if on_progress is not None:
+                on_progress(min(finished, episodes))
+    return table
+
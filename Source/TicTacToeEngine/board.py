@@ -0,0 +1,96 @@
+from typing import List, Optional, Tuple
+
+Move = Tuple[int, int]
+
+SIZE = 3
+# Cell (row, col) is bit 3 * row + col of a 9-bit mask
+FULL = (1 << SIZE * SIZE) - 1
+MOVE_BITS = {(i, j): 1 << (SIZE * i + j) for i in range(SIZE) for j in range(SIZE)}
+
+WIN_LINES = tuple(
+    [sum(MOVE_BITS[(i, j)] for j in range(SIZE)) for i in range(SIZE)]
+    + [sum(MOVE_BITS[(i, j)] for i in range(SIZE)) for j in range(SIZE)]
+    + [sum(MOVE_BITS[(i, i)] for i in range(SIZE)),
+       sum(MOVE_BITS[(SIZE - 1 - i, i)] for i in range(SIZE))]
+)
+
+# Lookups over all 512 masks: whether a mark's cells contain a line, and the
+# empty cells (in row-major order) for a mask of taken cells
+IS_WIN = tuple(any(mask & line == line for line in WIN_LINES) for mask in range(FULL + 1))
+FREE_MOVES = tuple(tuple(move for move, bit in MOVE_BITS.items() if not taken & bit) for taken in range(FULL + 1))
+
+
+class Board:
+    """A Tic Tac Toe position as two 9-bit masks, one for X's cells and one for O's"""
+
+    def __init__(self, x: int = 0, o: int = 0):
+        self.x = x
+        self.o = o
+
+    def winner(self) -> Optional[str]:
+        if IS_WIN[self.x]:
+            return "X"
+        if IS_WIN[self.o]:
+            return "O"
+        return None
+
+    def over(self) -> bool:
+        return (self.x | self.o) == FULL or IS_WIN[self.x] or IS_WIN[self.o]
+
+    def place_mark(self, move: Move, mark: str):
+        if mark == "X":
+            self.x |= MOVE_BITS[move]
+        else:
+            self.o |= MOVE_BITS[move]
+
+    def undo_mark(self, move: Move):
+        """Take back place_mark(); look-ahead plays and undoes moves instead of copying the board"""
+        bit = MOVE_BITS[move]
+        self.x &= ~bit
+        self.o &= ~bit
+
+    def is_winning_move(self, move: Move, mark: str) -> bool:
+        cells = self.x if mark == "X" else self.o
+        return IS_WIN[cells | MOVE_BITS[move]]
+
+    def mark_at(self, move: Move) -> Optional[str]:
+        bit = MOVE_BITS[move]
+        if self.x & bit:
+            return "X"
+        if self.o & bit:
+            return "O"
+        return None
+
+    def available_moves(self) -> Tuple[Move, ...]:
+        """Empty cells in row-major order (a shared tuple; do not modify)"""
+        return FREE_MOVES[self.x | self.o]
+
+    def get_next_board(self, move: Move, mark: str) -> "Board":
+        """A new board with the move played; this one is left as it is"""
+        bit = MOVE_BITS[move]
+        if mark == "X":
+            return Board(self.x | bit, self.o)
+        return Board(self.x, self.o | bit)
+
+    def make_key(self, mark: str) -> int:
+        """Integer key for the position with `mark` to move: X's cells, O's cells, then the mark"""
+        return (self.x << 10) | (self.o << 1) | (mark == "O")
+
+    def winning_cells(self) -> List[Move]:
+        """Cells on the winner's complete lines, or an empty list"""
+        cells = self.x if IS_WIN[self.x] else self.o
+        lines = 0
+        for line in WIN_LINES:
+            if cells & line == line:
+                lines |= line
+        return [move for move, bit in MOVE_BITS.items() if lines & bit]
+
+    def give_reward(self) -> float:
+        if self.over():
+            winner = self.winner()
+            if winner == "X":
+                return 1.0
+            elif winner == "O":
+                return -1.0
+            return 0.5
+        return 0.0
@@ -0,0 +1,139 @@
+"""Statistics for watching Q-learning converge.
+
+During training, train() collects one row per window of `report_every`
+episodes. Each row holds the episode count, training speed, Q-table size,
+mean |ΔQ| of the window's updates and the greedy player's win/draw/loss
+rates against RandomPlayer and THandPlayer. The rates come from games
+played as both X and O. MetricsLog appends rows to a CSV or JSONL file as
+they arrive.
+"""
+import csv
+import json
+import threading
+import time
+from collections import ChainMap
+from typing import Callable, Dict, List, Optional, TextIO
+
+from .board import Board
+from .players import Player, QPlayer, RandomPlayer, THandPlayer
+
+FIELDS = ("episodes", "seconds", "episodes_per_second", "q_states", "mean_abs_dq",
+          "random_win", "random_draw", "random_loss", "thand_win", "thand_draw", "thand_loss",
+          "epsilon", "alpha", "gamma")
+OPPONENTS = {"random": RandomPlayer, "thand": THandPlayer}
+
+
+def evaluate_player(make_player: Callable[[str], Player], opponent_class, games: int = 100) -> Dict[str, float]:
+    """Win, draw and loss rates of make_player(mark), playing X in half the games and O in the rest"""
+    results = {"win": 0, "draw": 0, "loss": 0}
+    for game in range(games):
+        mark = "X" if game % 2 == 0 else "O"
+        player = make_player(mark)
+        opponent = opponent_class(mark=player.opponent_mark)
+        current, other = (player, opponent) if mark == "X" else (opponent, player)
+        board = Board()
+        while not board.over():
+            board.place_mark(current.get_move(board), current.mark)
+            current, other = other, current
+        winner = board.winner()
+        results["draw" if winner is None else "win" if winner == mark else "loss"] += 1
+    return {outcome: count / games if games else 0.0 for outcome, count in results.items()}
+
+
+def evaluate_Q(Q, opponent_class, games: int = 100) -> Dict[str, float]:
+    """evaluate_player() for a greedy QPlayer.
+
+    The table is read through an overlay, so positions the player has not
+    seen are not added to it.
+    """
+    Q = ChainMap({}, Q)
+    return evaluate_player(lambda mark: QPlayer(mark=mark, Q=Q, epsilon=0), opponent_class, games)
+
+
+class WindowStats:
+    """Collects the Q-value changes of one window and turns them into a row"""
+
+    def __init__(self, eval_games: int = 100, epsilon: float = 0.9, alpha: float = 0.3, gamma: float = 0.9):
+        self.eval_games = eval_games
+        self.settings = {"epsilon": epsilon, "alpha": alpha, "gamma": gamma}
+        self.training_seconds = 0.0
+        self.window_start = time.perf_counter()
+        self.window_episodes = 0
+        self.changes = 0.0
+        self.updates = 0
+
+    def add_change(self, change: float):
+        self.changes += change
+        self.updates += 1
+
+    def add_changes(self, changes: float, updates: int):
+        """Count the changes of a window played somewhere else, such as a training process"""
+        self.changes += changes
+        self.updates += updates
+
+    def row(self, Q, episodes: int) -> Dict:
+        """Finish the window; evaluation time does not count towards episodes_per_second"""
+        now = time.perf_counter()
+        window_seconds = now - self.window_start
+        row = {
+            "episodes": episodes,
+            "seconds": round(self.training_seconds + window_seconds, 3),
+            "episodes_per_second": round((episodes - self.window_episodes) / window_seconds, 1)
+            if window_seconds > 0 else 0.0,
+            "q_states": len(Q),
+            "mean_abs_dq": self.changes / self.updates if self.updates else 0.0,
+        }
+        for name, opponent_class in OPPONENTS.items():
+            for outcome, rate in evaluate_Q(Q, opponent_class, self.eval_games).items():
+                row[f"{name}_{outcome}"] = rate
+        row.update(self.settings)
+
+        self.training_seconds += window_seconds
+        self.window_start = time.perf_counter()
+        self.window_episodes = episodes
+        self.changes = 0.0
+        self.updates = 0
+        return row
+
+
+class MetricsLog:
+    """Appends rows to a .csv or .jsonl file (chosen by extension) and keeps them in `rows`.
+
+    The training thread writes while the window may close the log, so both
+    hold a lock; rows written after close() are only kept in `rows`.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.rows: List[Dict] = []
+        self._file: Optional[TextIO] = None
+        self._csv = None
+        self._lock = threading.Lock()
+        if path is not None:
+            self._file = open(path, "w", newline="")
+            if not path.endswith(".jsonl"):
+                self._csv = csv.DictWriter(self._file, fieldnames=FIELDS)
+                self._csv.writeheader()
+
+    def write(self, row: Dict):
+        with self._lock:
+            self.rows.append(row)
+            if self._file is None:
+                return
+            if self._csv is not None:
+                self._csv.writerow(row)
+            else:
+                self._file.write(json.dumps(row) + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
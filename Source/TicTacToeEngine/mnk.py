@@ -0,0 +1,237 @@
+"""m,n,k games: k in a row on a board of any size (Tic Tac Toe is 3,3,3, Gomoku 15,15,5).
+
+MNKBoard has the same methods as Board, so the window and the players work
+with either. Every run of k cells (a "window") keeps a count of each mark;
+placing or undoing a mark only touches the windows through that cell, which
+gives the win check, a line-count evaluation and a Zobrist hash for the
+search in TicTacToeEngine.search without rescanning the board.
+"""
+import random
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from .board import SIZE, Board, Move
+
+# A window holding c marks of one player and none of the other is worth WINDOW_WEIGHTS_BASE ** c
+WINDOW_WEIGHTS_BASE = 10
+# Empty cells at most this far from a mark are candidate moves for the search
+NEIGHBOURHOOD = 2
+
+_DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+@lru_cache(maxsize=None)
+def _geometry(rows: int, cols: int, k: int):
+    """Windows, the windows through each cell and each cell's neighbourhood, shared per board shape"""
+    windows: List[Tuple[int, ...]] = []
+    for i in range(rows):
+        for j in range(cols):
+            for di, dj in _DIRECTIONS:
+                end_i, end_j = i + di * (k - 1), j + dj * (k - 1)
+                if 0 <= end_i < rows and 0 <= end_j < cols:
+                    windows.append(tuple((i + di * s) * cols + j + dj * s for s in range(k)))
+    through = [[] for _ in range(rows * cols)]
+    for w, cells in enumerate(windows):
+        for cell in cells:
+            through[cell].append(w)
+    neighbours = []
+    for i in range(rows):
+        for j in range(cols):
+            neighbours.append(tuple(a * cols + b
+                                    for a in range(max(0, i - NEIGHBOURHOOD), min(rows, i + NEIGHBOURHOOD + 1))
+                                    for b in range(max(0, j - NEIGHBOURHOOD), min(cols, j + NEIGHBOURHOOD + 1))
+                                    if (a, b) != (i, j)))
+    return tuple(windows), tuple(tuple(ws) for ws in through), tuple(neighbours)
+
+
+@lru_cache(maxsize=None)
+def _zobrist(cells: int) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """Random 64-bit keys for X and O on each cell (fixed seed, so hashes are stable)"""
+    rng = random.Random(cells)
+    return (tuple(rng.getrandbits(64) for _ in range(cells)),
+            tuple(rng.getrandbits(64) for _ in range(cells)))
+
+
+class MNKBoard:
+    """A rows x cols board where k marks in a row, column or diagonal win"""
+
+    def __init__(self, rows: int = SIZE, cols: int = SIZE, k: int = SIZE):
+        if not 1 <= k <= max(rows, cols):
+            raise ValueError(f"Cannot get {k} in a row on a {rows}x{cols} board")
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.size = rows * cols
+        self.windows, self.through, self.neighbours = _geometry(rows, cols, k)
+        self.x_keys, self.o_keys = _zobrist(self.size)
+        self.moves = tuple((i, j) for i in range(rows) for j in range(cols))
+        self.weights = (0,) + tuple(WINDOW_WEIGHTS_BASE ** c for c in range(1, k + 1))
+
+        self.cells: List[Optional[str]] = [None] * self.size
+        self.x = 0
+        self.o = 0
+        self.filled = 0
+        self.hash = 0
+        # Line-count evaluation from X's side, kept up to date by place_mark/undo_mark
+        self.score = 0
+        self.x_counts = [0] * len(self.windows)
+        self.o_counts = [0] * len(self.windows)
+        # Marks within NEIGHBOURHOOD of each cell
+        self.nearby = [0] * self.size
+        self.won: Optional[str] = None
+        self.history: List[Tuple[int, Optional[str]]] = []
+
+    @classmethod
+    def from_board(cls, board, k: Optional[int] = None) -> "MNKBoard":
+        """Copy any board with mark_at() (a Board, or another MNKBoard)"""
+        rows = getattr(board, "rows", SIZE)
+        cols = getattr(board, "cols", SIZE)
+        copy = cls(rows, cols, k if k is not None else getattr(board, "k", SIZE))
+        for move in copy.moves:
+            mark = board.mark_at(move)
+            if mark is not None:
+                copy.place_mark(move, mark)
+        return copy
+
+    def winner(self) -> Optional[str]:
+        return self.won
+
+    def over(self) -> bool:
+        return self.won is not None or self.filled == self.size
+
+    def place_mark(self, move: Move, mark: str):
+        cell = move[0] * self.cols + move[1]
+        self.history.append((cell, self.won))
+        self.cells[cell] = mark
+        self.filled += 1
+        weights = self.weights
+        score = self.score
+        if mark == "X":
+            self.x |= 1 << cell
+            self.hash ^= self.x_keys[cell]
+            mine, theirs = self.x_counts, self.o_counts
+            sign = 1
+        else:
+            self.o |= 1 << cell
+            self.hash ^= self.o_keys[cell]
+            mine, theirs = self.o_counts, self.x_counts
+            sign = -1
+        for w in self.through[cell]:
+            count = mine[w]
+            mine[w] = count + 1
+            if theirs[w]:
+                if not count:
+                    # The window was the opponent's and is now blocked
+                    score += sign * weights[theirs[w]]
+                continue
+            score += sign * (weights[count + 1] - weights[count])
+            if count + 1 == self.k:
+                self.won = mark
+        self.score = score
+        nearby = self.nearby
+        for n in self.neighbours[cell]:
+            nearby[n] += 1
+
+    def undo_mark(self, move: Move):
+        """Take back the last place_mark(), which must have been this move"""
+        cell, won = self.history.pop()
+        mark = self.cells[cell]
+        self.cells[cell] = None
+        self.filled -= 1
+        self.won = won
+        weights = self.weights
+        score = self.score
+        if mark == "X":
+            self.x &= ~(1 << cell)
+            self.hash ^= self.x_keys[cell]
+            mine, theirs = self.x_counts, self.o_counts
+            sign = 1
+        else:
+            self.o &= ~(1 << cell)
+            self.hash ^= self.o_keys[cell]
+            mine, theirs = self.o_counts, self.x_counts
+            sign = -1
+        for w in self.through[cell]:
+            count = mine[w] - 1
+            mine[w] = count
+            if theirs[w]:
+                if not count:
+                    score -= sign * weights[theirs[w]]
+                continue
+            score -= sign * (weights[count + 1] - weights[count])
+        self.score = score
+        nearby = self.nearby
+        for n in self.neighbours[cell]:
+            nearby[n] -= 1
+
+    def is_winning_move(self, move: Move, mark: str) -> bool:
+        cell = move[0] * self.cols + move[1]
+        mine, theirs = (self.x_counts, self.o_counts) if mark == "X" else (self.o_counts, self.x_counts)
+        return any(mine[w] == self.k - 1 and not theirs[w] for w in self.through[cell])
+
+    def move_gain(self, move: Move, mark: str) -> int:
+        """How much the move improves the evaluation for `mark`, used to order moves"""
+        cell = move[0] * self.cols + move[1]
+        mine, theirs = (self.x_counts, self.o_counts) if mark == "X" else (self.o_counts, self.x_counts)
+        weights = self.weights
+        gain = 0
+        for w in self.through[cell]:
+            if theirs[w]:
+                if not mine[w]:
+                    gain += weights[theirs[w]]
+            else:
+                gain += weights[mine[w] + 1] - weights[mine[w]]
+        return gain
+
+    def mark_at(self, move: Move) -> Optional[str]:
+        return self.cells[move[0] * self.cols + move[1]]
+
+    def available_moves(self) -> List[Move]:
+        """Empty cells in row-major order"""
+        cells = self.cells
+        return [move for move, mark in zip(self.moves, cells) if mark is None]
+
+    def candidate_moves(self) -> List[Move]:
+        """Empty cells near a mark (the centre on an empty board); far-away moves are not searched"""
+        if not self.filled:
+            return [self.moves[(self.rows // 2) * self.cols + self.cols // 2]]
+        cells = self.cells
+        nearby = self.nearby
+        return [self.moves[cell] for cell in range(self.size) if nearby[cell] and cells[cell] is None]
+
+    def get_next_board(self, move: Move, mark: str) -> "MNKBoard":
+        """A new board with the move played; this one is left as it is"""
+        board = MNKBoard.from_board(self, self.k)
+        board.place_mark(move, mark)
+        return board
+
+    def make_key(self, mark: str) -> int:
+        """Same layout as Board.make_key(): X's cells, O's cells, then the mark"""
+        return (self.x << (self.size + 1)) | (self.o << 1) | (mark == "O")
+
+    def winning_cells(self) -> List[Move]:
+        if self.won is None:
+            return []
+        counts = self.x_counts if self.won == "X" else self.o_counts
+        cells = set()
+        for w, window in enumerate(self.windows):
+            if counts[w] == self.k:
+                cells.update(window)
+        return [self.moves[cell] for cell in sorted(cells)]
+
+    def give_reward(self) -> float:
+        if self.over():
+            winner = self.winner()
+            if winner == "X":
+                return 1.0
+            elif winner == "O":
+                return -1.0
+            return 0.5
+        return 0.0
+
+
+def new_board(rows: int = SIZE, cols: int = SIZE, k: int = SIZE):
+    """The fast bitmask Board for classic Tic Tac Toe, an MNKBoard for anything else"""
+    if rows == cols == k == SIZE:
+        return Board()
+    return MNKBoard(rows, cols, k)
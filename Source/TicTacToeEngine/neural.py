@@ -0,0 +1,185 @@
+"""A small value/policy network for Tic Tac Toe, trained by self-play (needs torch).
+
+The network sees a position from the side of the player to move (18
+inputs: their cells, then the opponent's) and returns a logit per cell and
+a value in [-1, 1] for the mover, where 1 is a win, -1 a loss and 0 a
+draw. This is give_reward() turned to the mover's side, with draws scored
+neutral for both players.
+
+Training runs many games at once in a BatchEnv, without a window. Each
+move is scored by one batched look-ahead: a move that ends the game gets
+its true value, and any other move gets minus the network's value for the
+opponent. The best of those scores is the value target for the position,
+the best move is the policy target, and the game goes on with that move
+or, with probability epsilon, a random one. The trained network is saved
+as TorchScript. NetworkPlayer needs one forward pass per move and loads
+the file on first use.
+"""
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+from torch import nn
+
+from .batch import BatchEnv
+from .board import FULL, IS_WIN, MOVE_BITS, Board
+from .players import ComputerPlayer
+from .qtable import CELLS, MOVES
+
+HIDDEN = 64
+
+_IS_WIN = np.array(IS_WIN)
+_CELL_BITS = 1 << np.arange(CELLS)
+_MOVE_INDEX = {move: bit.bit_length() - 1 for move, bit in MOVE_BITS.items()}
+_networks: Dict[str, torch.jit.ScriptModule] = {}
+
+
+def encode(mine: np.ndarray, theirs: np.ndarray) -> np.ndarray:
+    """(n, 18) float32 network inputs for arrays of 9-bit masks: the mover's cells, then the opponent's"""
+    mine = np.asarray(mine, dtype=np.int64).reshape(-1, 1)
+    theirs = np.asarray(theirs, dtype=np.int64).reshape(-1, 1)
+    return np.concatenate([mine & _CELL_BITS, theirs & _CELL_BITS], axis=1).astype(bool).astype(np.float32)
+
+
+class TicTacToeNet(nn.Module):
+    def __init__(self, hidden: int = HIDDEN):
+        super().__init__()
+        self.body = nn.Sequential(
+            nn.Linear(2 * CELLS, hidden), nn.ReLU(),
+            nn.Linear(hidden, hidden), nn.ReLU(),
+        )
+        self.policy = nn.Linear(hidden, CELLS)
+        self.value = nn.Linear(hidden, 1)
+
+    def forward(self, x: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        h = self.body(x)
+        return self.policy(h), torch.tanh(self.value(h)).squeeze(-1)
+
+
+def lookahead(model: nn.Module, mine: np.ndarray, theirs: np.ndarray, legal: np.ndarray) -> np.ndarray:
+    """(n, 9) score of every move for the mover, -inf on taken cells, from one batched forward pass"""
+    after = mine[:, None] | _CELL_BITS
+    opponent = np.broadcast_to(theirs[:, None], after.shape)
+    with torch.no_grad():
+        _, value = model(torch.from_numpy(encode(opponent, after)))
+    scores = -value.numpy().reshape(after.shape)
+    scores = np.where(_IS_WIN[after], 1.0, np.where((after | opponent) == FULL, 0.0, scores))
+    return np.where(legal, scores, -np.inf).astype(np.float32)
+
+
+def self_play(model: nn.Module, n_games: int, epsilon: float,
+              rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Play n_games side by side; returns inputs, legal masks, policy targets and value targets per move"""
+    env = BatchEnv(n_games)
+    inputs, legals, moves, values = [], [], [], []
+    actions = np.zeros(n_games, dtype=np.intp)
+    while not env.done.all():
+        playing = np.flatnonzero(~env.done)
+        x_to_move = env.turn[playing] == 1
+        mine = np.where(x_to_move, env.x[playing], env.o[playing])
+        theirs = np.where(x_to_move, env.o[playing], env.x[playing])
+        legal = env.legal_mask()[playing]
+
+        scores = lookahead(model, mine, theirs, legal)
+        best = scores.argmax(axis=1)
+        chosen = best.copy()
+        explore = rng.random(len(playing)) < epsilon
+        if explore.any():
+            noise = rng.random((int(explore.sum()), CELLS))
+            chosen[explore] = np.argmax(np.where(legal[explore], noise, -1.0), axis=1)
+
+        inputs.append(encode(mine, theirs))
+        legals.append(legal)
+        moves.append(best)
+        values.append(scores[np.arange(len(playing)), best])
+        actions[:] = 0
+        actions[playing] = chosen
+        env.step(actions)
+    return np.concatenate(inputs), np.concatenate(legals), np.concatenate(moves), np.concatenate(values)
+
+
+def train_network(games: int = 50000, batch_games: int = 500, steps_per_batch: int = 10,
+                  epsilon: float = 0.3, lr: float = 1e-3, seed: Optional[int] = None,
+                  model: Optional[TicTacToeNet] = None,
+                  on_progress: Optional[Callable[[int, float], None]] = None) -> TicTacToeNet:
+    """Train by self-play on the CPU; on_progress(games_played, loss) is called after every batch of games"""
+    if seed is not None:
+        torch.manual_seed(seed)
+    rng = np.random.default_rng(seed)
+    model = TicTacToeNet() if model is None else model
+    optimizer = torch.optim.Adam(model.parameters(), lr=lr)
+    played = 0
+    while played < games:
+        n_games = min(batch_games, games - played)
+        model.eval()
+        inputs, legal, moves, values = self_play(model, n_games, epsilon, rng)
+        x = torch.from_numpy(inputs)
+        illegal = torch.from_numpy(~legal)
+        move_targets = torch.from_numpy(moves.astype(np.int64))
+        value_targets = torch.from_numpy(values)
+
+        model.train()
+        for _ in range(steps_per_batch):
+            logits, predicted = model(x)
+            loss = (F.mse_loss(predicted, value_targets)
+                    + F.cross_entropy(logits.masked_fill(illegal, -1e9), move_targets))
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+        played += n_games
+        if on_progress is not None:
+            on_progress(played, float(loss))
+    model.eval()
+    return model
+
+
+def export(model: TicTacToeNet, path: str):
+    torch.jit.script(model.eval()).save(path)
+
+
+def load_network(path: str) -> torch.jit.ScriptModule:
+    """Load a TorchScript network once per process; the file is only read the first time it is asked for"""
+    network = _networks.get(path)
+    if network is None:
+        # One thread is fastest for a network this small
+        torch.set_num_threads(1)
+        network = torch.jit.load(path, map_location="cpu")
+        network.eval()
+        _networks[path] = network
+    return network
+
+
+class NetworkPlayer(ComputerPlayer):
+    """Plays the policy head's best legal move, or the best look-ahead move with lookahead=True"""
+
+    def __init__(self, mark, network: nn.Module, lookahead: bool = False):
+        super(NetworkPlayer, self).__init__(mark=mark)
+        self.network = network
+        self.lookahead = lookahead
+
+    def get_move(self, board):
+        moves = board.available_moves()
+        if not moves:
+            return None
+        mine, theirs = (board.x, board.o) if self.mark == "X" else (board.o, board.x)
+        legal = np.zeros((1, CELLS), dtype=bool)
+        legal[0, [_MOVE_INDEX[move] for move in moves]] = True
+        if self.lookahead:
+            scores = lookahead(self.network, np.array([mine]), np.array([theirs]), legal)[0]
+        else:
+            with torch.no_grad():
+                logits, _ = self.network(torch.from_numpy(encode(mine, theirs)))
+            scores = np.where(legal[0], logits[0].numpy(), -np.inf)
+        return MOVES[int(scores.argmax())]
+
+
+def move_time(network: nn.Module, moves: int = 1000) -> float:
+    """Mean seconds per NetworkPlayer move from the empty board"""
+    player = NetworkPlayer("X", network)
+    board = Board()
+    start = time.perf_counter()
+    for _ in range(moves):
+        player.get_move(board)
+    return (time.perf_counter() - start) / moves
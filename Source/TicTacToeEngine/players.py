@@ -0,0 +1,99 @@
+import numpy as np
+
+from .solver import solve
+
+
+class Player(object):
+    def __init__(self, mark):
+        self.mark = mark
+
+    @property
+    def opponent_mark(self):
+        if self.mark == 'X':
+            return 'O'
+        elif self.mark == 'O':
+            return 'X'
+        else:
+            print("The player's mark must be either 'X' or 'O'.")
+
+class HumanPlayer(Player):
+    pass
+
+class ComputerPlayer(Player):
+    pass
+
+class RandomPlayer(ComputerPlayer):
+    @staticmethod
+    def get_move(board):
+        moves = board.available_moves()
+        if moves:
+            return moves[np.random.randint(len(moves))]
+
+class THandPlayer(ComputerPlayer):
+    def __init__(self, mark):
+        super(THandPlayer, self).__init__(mark=mark)
+
+    def get_move(self, board):
+        moves = board.available_moves()
+        if moves:
+            for move in moves:
+                if THandPlayer.next_move_winner(board, move, self.mark):
+                    return move
+                elif THandPlayer.next_move_winner(board, move, self.opponent_mark):
+                    return move
+            else:
+                return RandomPlayer.get_move(board)
+
+    @staticmethod
+    def next_move_winner(board, move, mark):
+        return board.is_winning_move(move, mark)
+
+
+class QPlayer(ComputerPlayer):
+    def __init__(self, mark, Q={}, epsilon=0.2):
+        super(QPlayer, self).__init__(mark=mark)
+        self.Q = Q
+        self.epsilon = epsilon
+
+    def get_move(self, board):
+        if np.random.uniform() < self.epsilon:
+            return RandomPlayer.get_move(board)
+        else:
+            state_key = QPlayer.make_and_maybe_add_key(board, self.mark, self.Q)
+            Qs = self.Q[state_key]
+            if self.mark == "X":
+                return QPlayer.stochastic_argminmax(Qs, max)
+            elif self.mark == "O":
+                return QPlayer.stochastic_argminmax(Qs, min)
+
+    @staticmethod
+    def make_and_maybe_add_key(board, mark, Q):
+        default_Qvalue = 1.0
+        state_key = board.make_key(mark)
+        if state_key not in Q:
+            moves = board.available_moves()
+            Q[state_key] = {move: default_Qvalue for move in moves}
+        return state_key
+
+    @staticmethod
+    def stochastic_argminmax(Qs, min_or_max):
+        min_or_maxQ = min_or_max(list(Qs.values()))
+        if list(Qs.values()).count(min_or_maxQ) > 1:
+            best_options = [move for move in list(Qs.keys()) if Qs[move] == min_or_maxQ]
+            move = best_options[np.random.randint(len(best_options))]
+        else:
+            move = min_or_max(Qs, key=Qs.get)
+        return move
+
+
+class PerfectPlayer(ComputerPlayer):
+    """Plays a solved game: never loses, and wins as soon as the opponent lets it"""
+
+    def __init__(self, mark):
+        super(PerfectPlayer, self).__init__(mark=mark)
+        self.best_moves = solve()[1]
+
+    def get_move(self, board):
+        moves = self.best_moves.get(board.make_key(self.mark))
+        if moves:
+            return moves[np.random.randint(len(moves))]
@@ -0,0 +1,213 @@
+import pickle
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .board import FULL, MOVE_BITS, SIZE, Board, Move
+
+CELLS = SIZE * SIZE
+MOVES = tuple(MOVE_BITS)
+DEFAULT_QVALUE = 1.0
+
+
+def _symmetries() -> List[Tuple[int, ...]]:
+    """The 8 rotations and reflections of the board, each as old cell -> new cell"""
+    def index(i, j):
+        return SIZE * i + j
+
+    last = SIZE - 1
+    maps = [
+        lambda i, j: (i, j),
+        lambda i, j: (j, last - i),
+        lambda i, j: (last - i, last - j),
+        lambda i, j: (last - j, i),
+        lambda i, j: (i, last - j),
+        lambda i, j: (last - i, j),
+        lambda i, j: (j, i),
+        lambda i, j: (last - j, last - i),
+    ]
+    return [tuple(index(*f(i, j)) for i in range(SIZE) for j in range(SIZE)) for f in maps]
+
+
+SYMMETRIES = _symmetries()
+# TRANSFORMED[s][mask]: a 9-bit mask with symmetry s applied
+TRANSFORMED = [
+    [sum(1 << perm[k] for k in range(CELLS) if mask >> k & 1) for mask in range(FULL + 1)]
+    for perm in SYMMETRIES
+]
+
+# The same tables as arrays, for looking up many positions at once
+SYMMETRY_ARRAY = np.array(SYMMETRIES, dtype=np.intp)
+TRANSFORMED_ARRAY = np.array(TRANSFORMED, dtype=np.int64)
+
+RECORD = np.dtype([("key", "<i4"), ("q", "<f4", (CELLS,))])
+
+
+def split_key(key: int) -> Tuple[int, int, str]:
+    """Undo Board.make_key(): (X's cells, O's cells, mark to move)"""
+    return key >> 10, (key >> 1) & FULL, "O" if key & 1 else "X"
+
+
+def legacy_key(key: str) -> int:
+    """Board.make_key() for a key saved by older versions: nine cells (1 X, 0 O, 9 empty), then the mark"""
+    x = o = 0
+    for cell, value in enumerate(key[:CELLS]):
+        if value == "1":
+            x |= 1 << cell
+        elif value == "0":
+            o |= 1 << cell
+    return (x << 10) | (o << 1) | (key[CELLS:] == "O")
+
+
+def canonical(key: int) -> Tuple[int, int]:
+    """The smallest key among the 8 symmetric positions, and the symmetry that gives it"""
+    x, o, _ = split_key(key)
+    turn = key & 1
+    best, best_symmetry = None, 0
+    for s, table in enumerate(TRANSFORMED):
+        candidate = (table[x] << 10) | (table[o] << 1) | turn
+        if best is None or candidate < best:
+            best, best_symmetry = candidate, s
+    return best, best_symmetry
+
+
+def reachable_states() -> List[int]:
+    """Canonical keys of every position that can occur with a move still to play, X moving first"""
+    seen = set()
+    frontier = [Board()]
+    mark = "X"
+    while frontier:
+        following = []
+        for board in frontier:
+            key, _ = canonical(board.make_key(mark))
+            if key in seen:
+                continue
+            seen.add(key)
+            for move in board.available_moves():
+                next_board = board.get_next_board(move, mark)
+                if not next_board.over():
+                    following.append(next_board)
+        frontier = following
+        mark = "O" if mark == "X" else "X"
+    return sorted(seen)
+
+
+class _QRow(dict):
+    """Q-values of one position; assignments are written back to the table"""
+
+    def __init__(self, table: "QTable", row: int, symmetry: int, values: Dict[Move, float]):
+        super().__init__(values)
+        self.table = table
+        self.row = row
+        self.symmetry = symmetry
+
+    def __setitem__(self, move: Move, value: float):
+        super().__setitem__(move, value)
+        self.table.values[self.row, SYMMETRIES[self.symmetry][MOVE_BITS[move].bit_length() - 1]] = value
+
+
+class QTable:
+    """Q-values for the 627 unfinished positions that are distinct up to rotation and reflection.
+
+    Used wherever QPlayer expects its Q dict: a state key (Board.make_key())
+    maps to {move: value}, looked up through the symmetric canonical position
+    so the table holds each position once. Values sit in one NumPy record array
+    (key, 9 Q-values with NaN for taken cells) that save() writes as .npy and
+    load() memory-maps. Positions outside the table, such as finished games,
+    fall back to a plain dict.
+    """
+
+    def __init__(self, records: Optional[np.ndarray] = None):
+        if records is None:
+            keys = reachable_states()
+            records = np.zeros(len(keys), dtype=RECORD)
+            records["key"] = keys
+            for row, key in enumerate(keys):
+                x, o, _ = split_key(key)
+                taken = x | o
+                records["q"][row] = [np.nan if taken >> k & 1 else DEFAULT_QVALUE for k in range(CELLS)]
+        self.records = records
+        self.values = records["q"]
+        self.index = {int(key): row for row, key in enumerate(records["key"])}
+        self.extra: Dict[int, Dict[Move, float]] = {}
+
+    def _locate(self, state_key: int) -> Tuple[Optional[int], int]:
+        key, symmetry = canonical(state_key)
+        return self.index.get(key), symmetry
+
+    def locate_many(self, state_keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows and symmetries for an array of state keys, all of which must be in the table"""
+        state_keys = np.asarray(state_keys, dtype=np.int64)
+        x = state_keys >> 10
+        o = (state_keys >> 1) & FULL
+        candidates = (TRANSFORMED_ARRAY[:, x] << 10) | (TRANSFORMED_ARRAY[:, o] << 1) | (state_keys & 1)
+        symmetries = candidates.argmin(axis=0)
+        keys = candidates[symmetries, np.arange(len(state_keys))]
+        table_keys = self.records["key"]
+        rows = np.searchsorted(table_keys, keys)
+        if len(rows) and (rows.max() >= len(table_keys) or np.any(table_keys[rows] != keys)):
+            raise KeyError("Some positions are finished or unreachable and have no row")
+        return rows, symmetries
+
+    def __contains__(self, state_key: int) -> bool:
+        return self._locate(state_key)[0] is not None or state_key in self.extra
+
+    def __getitem__(self, state_key: int) -> Dict[Move, float]:
+        row, symmetry = self._locate(state_key)
+        if row is None:
+            return self.extra[state_key]
+        x, o, _ = split_key(state_key)
+        taken = x | o
+        perm = SYMMETRIES[symmetry]
+        q = self.values[row]
+        values = {move: float(q[perm[k]]) for k, move in enumerate(MOVES) if not taken >> k & 1}
+        return _QRow(self, row, symmetry, values)
+
+    def __setitem__(self, state_key: int, Qs: Dict[Move, float]):
+        row, symmetry = self._locate(state_key)
+        if row is None:
+            self.extra[state_key] = Qs
+            return
+        perm = SYMMETRIES[symmetry]
+        for move, value in Qs.items():
+            self.values[row, perm[MOVE_BITS[move].bit_length() - 1]] = value
+
+    def __len__(self) -> int:
+        return len(self.index) + len(self.extra)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(list(self.index) + list(self.extra))
+
+    @classmethod
+    def from_dict(cls, Q: Dict[int, Dict[Move, float]]) -> "QTable":
+        """Fold a dict Q-table from training into canonical positions, averaging symmetric copies"""
+        table = cls()
+        totals = np.zeros(table.values.shape)
+        counts = np.zeros(table.values.shape)
+        for state_key, Qs in Q.items():
+            row, symmetry = table._locate(state_key)
+            if row is None:
+                continue
+            perm = SYMMETRIES[symmetry]
+            for move, value in Qs.items():
+                cell = perm[MOVE_BITS[move].bit_length() - 1]
+                totals[row, cell] += value
+                counts[row, cell] += 1
+        seen = counts > 0
+        table.values[seen] = totals[seen] / counts[seen]
+        return table
+
+    @classmethod
+    def from_legacy(cls, path: str) -> "QTable":
+        """Convert a pickled dict Q-table with string keys, as saved by older versions"""
+        with open(path, "rb") as file:
+            Q = pickle.load(file)
+        return cls.from_dict({legacy_key(key): Qs for key, Qs in Q.items()})
+
+    def save(self, path: str):
+        np.save(path, self.records)
+
+    @classmethod
+    def load(cls, path: str) -> "QTable":
+        """Memory-map a saved table; updates during play stay in memory and never touch the file"""
+        return cls(np.load(path, mmap_mode="c"))
@@ -0,0 +1,142 @@
+import time
+from typing import Dict, Optional, Tuple
+
+from .board import Move
+from .mnk import MNKBoard
+from .players import ComputerPlayer
+
+# Above any line-count evaluation; a win scores WIN_SCORE plus the empty cells
+# left, so quicker wins score higher and the score depends only on the position
+WIN_SCORE = 10 ** 12
+# Transposition table entries: the stored score is exact, a lower bound or an upper bound
+EXACT, LOWER, UPPER = 0, 1, 2
+# Entries kept before the table is cleared
+TABLE_LIMIT = 1 << 20
+# The side to move is part of the position
+O_TO_MOVE = 0x9E3779B97F4A7C15
+
+
+class _Timeout(Exception):
+    pass
+
+
+class AlphaBetaPlayer(ComputerPlayer):
+    """Negamax alpha-beta search for any m,n,k board.
+
+    Searches one ply deeper at a time until `time_budget` seconds are used,
+    and plays the best move of the deepest finished search. Moves are tried
+    in transposition-table-first, then best-evaluation order, and only cells
+    near existing marks are searched. The table (keyed by the board's
+    Zobrist hash) is kept between moves.
+    """
+
+    def __init__(self, mark, time_budget: float = 1.0, max_depth: Optional[int] = None):
+        super(AlphaBetaPlayer, self).__init__(mark=mark)
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.table: Dict[int, Tuple[int, int, int, Optional[Move]]] = {}
+        self.deadline = 0.0
+        self.nodes = 0
+        self.depth_reached = 0
+
+    def get_move(self, board):
+        if board.over():
+            return None
+        if not isinstance(board, MNKBoard):
+            board = MNKBoard.from_board(board)
+        if len(self.table) >= TABLE_LIMIT:
+            self.table.clear()
+        self.deadline = time.perf_counter() + self.time_budget
+        self.nodes = 0
+
+        moves = self._ordered_moves(board, self.mark, None)
+        best = moves[0]
+        max_depth = board.size - board.filled
+        if self.max_depth is not None:
+            max_depth = min(max_depth, self.max_depth)
+        for depth in range(1, max_depth + 1):
+            try:
+                score, move = self._root(board, depth, best)
+            except _Timeout:
+                break
+            best = move
+            self.depth_reached = depth
+            if abs(score) >= WIN_SCORE:
+                break
+        return best
+
+    def _root(self, board: MNKBoard, depth: int, first: Move) -> Tuple[int, Move]:
+        mark, other = self.mark, self.opponent_mark
+        alpha, beta = -2 * WIN_SCORE, 2 * WIN_SCORE
+        best_move = first
+        moves = self._ordered_moves(board, mark, first)
+        for move in moves:
+            board.place_mark(move, mark)
+            try:
+                score = -self._negamax(board, other, mark, depth - 1, -beta, -alpha)
+            finally:
+                board.undo_mark(move)
+            if score > alpha:
+                alpha, best_move = score, move
+        return alpha, best_move
+
+    def _negamax(self, board: MNKBoard, mark: str, other: str, depth: int, alpha: int, beta: int) -> int:
+        """Score for `mark`, who is to move; the previous move may have ended the game"""
+        self.nodes += 1
+        if not self.nodes & 1023 and time.perf_counter() > self.deadline:
+            raise _Timeout
+        empty = board.size - board.filled
+        if board.won is not None:
+            return -(WIN_SCORE + empty)
+        if not empty:
+            return 0
+        if depth <= 0:
+            return board.score if mark == "X" else -board.score
+
+        original_alpha = alpha
+        key = board.hash ^ O_TO_MOVE if mark == "O" else board.hash
+        entry = self.table.get(key)
+        table_move = None
+        if entry is not None:
+            entry_depth, entry_score, flag, table_move = entry
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return entry_score
+                if flag == LOWER:
+                    alpha = max(alpha, entry_score)
+                else:
+                    beta = min(beta, entry_score)
+                if alpha >= beta:
+                    return entry_score
+
+        best, best_move = -2 * WIN_SCORE, None
+        for move in self._ordered_moves(board, mark, table_move):
+            board.place_mark(move, mark)
+            try:
+                score = -self._negamax(board, other, mark, depth - 1, -beta, -alpha)
+            finally:
+                board.undo_mark(move)
+            if score > best:
+                best, best_move = score, move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        if best <= original_alpha:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table[key] = (depth, best, flag, best_move)
+        return best
+
+    @staticmethod
+    def _ordered_moves(board: MNKBoard, mark: str, first: Optional[Move]):
+        moves = board.candidate_moves()
+        moves.sort(key=lambda move: board.move_gain(move, mark), reverse=True)
+        if first is not None and first in moves:
+            moves.remove(first)
+            moves.insert(0, first)
+        return moves
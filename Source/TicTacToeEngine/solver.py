@@ -0,0 +1,61 @@
+from functools import lru_cache
+from typing import Dict, Tuple
+
+from .board import FULL, IS_WIN, MOVE_BITS, Board, Move
+
+# A win is worth more the earlier it comes, so the solver wins quickly and
+# loses as late as possible; draws are 0
+WIN_SCORE = len(MOVE_BITS) + 1
+
+
+def _negamax(mine: int, theirs: int, table: Dict[Tuple[int, int], int]) -> int:
+    """Score for the player to move, who owns `mine`, with perfect play from both sides"""
+    position = (mine, theirs)
+    score = table.get(position)
+    if score is not None:
+        return score
+    taken = mine | theirs
+    if IS_WIN[theirs]:
+        score = -(WIN_SCORE - bin(taken).count("1"))
+    elif taken == FULL:
+        score = 0
+    else:
+        score = max(-_negamax(theirs, mine | bit, table) for bit in MOVE_BITS.values() if not taken & bit)
+    table[position] = score
+    return score
+
+
+@lru_cache(maxsize=None)
+def solve() -> Tuple[Dict[int, int], Dict[int, Tuple[Move, ...]]]:
+    """Solve every position reachable from the empty board, X moving first.
+
+    Returns two dicts keyed by Board.make_key(): the score for the player to
+    move (positive wins, 0 draws, negative loses) and, for unfinished
+    positions, every move that keeps that score. The tree has 5,478
+    positions and is solved once per process, on first use.
+    """
+    table: Dict[Tuple[int, int], int] = {}
+    scores: Dict[int, int] = {}
+    best_moves: Dict[int, Tuple[Move, ...]] = {}
+
+    def visit(board: Board, mark: str):
+        key = board.make_key(mark)
+        if key in scores:
+            return
+        mine, theirs = (board.x, board.o) if mark == "X" else (board.o, board.x)
+        score = _negamax(mine, theirs, table)
+        scores[key] = score
+        if board.over():
+            return
+        other = "O" if mark == "X" else "X"
+        best = []
+        for move in board.available_moves():
+            if -table[(theirs, mine | MOVE_BITS[move])] == score:
+                best.append(move)
+            board.place_mark(move, mark)
+            visit(board, other)
+            board.undo_mark(move)
+        best_moves[key] = tuple(best)
+
+    visit(Board(), "X")
+    return scores, best_moves
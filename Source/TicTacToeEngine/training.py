@@ -0,0 +1,266 @@
+import multiprocessing
+import threading
+from queue import Empty
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from .board import Board, Move
+from .metrics import MetricsLog, WindowStats
+from .players import QPlayer
+
+QTable = Dict[int, Dict[Move, float]]
+
+
+def learn_Q(Q: QTable, board: Board, move: Move, mark: str, other_mark: str, alpha: float, gamma: float) -> float:
+    """One Q-learning update for `mark` playing `move` on `board` (the board is left unchanged).
+
+    X maximises and O minimises, so the value of the next position is the best
+    Q-value for the player who moves there. Returns the size of the change.
+    """
+    state_key = QPlayer.make_and_maybe_add_key(board, mark, Q)
+    board.place_mark(move, mark)
+    reward = board.give_reward()
+    next_state_key = QPlayer.make_and_maybe_add_key(board, other_mark, Q)
+    over = board.over()
+    board.undo_mark(move)
+    if over:
+        expected = reward
+    else:
+        next_Qs = Q[next_state_key]
+        if mark == "X":
+            expected = reward + (gamma * min(next_Qs.values()))
+        else:
+            expected = reward + (gamma * max(next_Qs.values()))
+    change = alpha * (expected - Q[state_key][move])
+    Q[state_key][move] += change
+    return abs(change)
+
+
+def play_episode(player1, player2, Q: QTable, alpha: float = 0.3, gamma: float = 0.9,
+                 stats: Optional[WindowStats] = None) -> Optional[str]:
+    """Play one learning game like Game.play() with two computer players; returns the winner"""
+    board = Board()
+    current, other = player1, player2
+    while True:
+        move = current.get_move(board)
+        change = learn_Q(Q, board, move, current.mark, other.mark, alpha, gamma)
+        if stats is not None:
+            stats.add_change(change)
+        board.place_mark(move, current.mark)
+        if board.over():
+            return board.winner()
+        current, other = other, current
+
+
+def train(episodes: int, epsilon: float = 0.9, alpha: float = 0.3, gamma: float = 0.9,
+          Q: Optional[QTable] = None, on_progress: Optional[Callable[[int], None]] = None,
+          report_every: int = 1000, stop: Optional[threading.Event] = None,
+          on_stats: Optional[Callable[[Dict], None]] = None, eval_games: int = 100) -> QTable:
+    """Train two QPlayers sharing one Q-table against each other without a window.
+
+    on_progress(episodes_done) is called every `report_every` episodes and at
+    the end. Setting `stop` ends training early with the table learned so far.
+    With on_stats, each window of `report_every` episodes also ends with a
+    row of metrics.WindowStats, evaluated over `eval_games` games per opponent.
+    """
+    Q = {} if Q is None else Q
+    player1 = QPlayer(mark="X", Q=Q, epsilon=epsilon)
+    player2 = QPlayer(mark="O", Q=Q, epsilon=epsilon)
+    stats = WindowStats(eval_games, epsilon, alpha, gamma) if on_stats is not None else None
+    done = 0
+    while done < episodes and not (stop is not None and stop.is_set()):
+        batch = min(report_every, episodes - done)
+        for _ in range(batch):
+            play_episode(player1, player2, Q, alpha, gamma, stats)
+        done += batch
+        if stats is not None:
+            on_stats(stats.row(Q, done))
+        if on_progress is not None:
+            on_progress(done)
+    return Q
+
+
+def merge_Q(tables: List[QTable]) -> QTable:
+    """Average Q-tables trained separately; a state counts only in the tables that reached it"""
+    merged: QTable = {}
+    counts: Dict[int, int] = {}
+    for table in tables:
+        for state_key, Qs in table.items():
+            if state_key in merged:
+                target = merged[state_key]
+                for move, value in Qs.items():
+                    target[move] += value
+                counts[state_key] += 1
+            else:
+                merged[state_key] = dict(Qs)
+                counts[state_key] = 1
+    for state_key, count in counts.items():
+        if count > 1:
+            Qs = merged[state_key]
+            for move in Qs:
+                Qs[move] /= count
+    return merged
+
+
+def _train_shard(queue, shard, episodes, seed, epsilon, alpha, gamma, report_every, snapshots):
+    """Train one share of the episodes, sending a message after every window.
+
+    Each message holds the window's episodes, the sum and count of its Q
+    changes and, with `snapshots`, a copy of the table so far.
+    """
+    # Forked workers would otherwise share the parent's random state
+    np.random.seed(seed)
+    Q: QTable = {}
+    player1 = QPlayer(mark="X", Q=Q, epsilon=epsilon)
+    player2 = QPlayer(mark="O", Q=Q, epsilon=epsilon)
+    stats = WindowStats(0, epsilon, alpha, gamma)
+    done = 0
+    while done < episodes:
+        batch = min(report_every, episodes - done)
+        for _ in range(batch):
+            play_episode(player1, player2, Q, alpha, gamma, stats)
+        done += batch
+        # The queue pickles in a background thread, so the table is copied now
+        snapshot = {state_key: dict(Qs) for state_key, Qs in Q.items()} if snapshots else None
+        queue.put(("window", shard, (batch, stats.changes, stats.updates, snapshot)))
+        stats.changes, stats.updates = 0.0, 0
+    queue.put(("done", shard, Q))
+
+
+class Trainer:
+    """Runs train() off the UI thread, optionally sharded over processes.
+
+    The window starts it, polls `episodes_done`/`done` from a Tk after() loop
+    and reads `Q` once training has finished. With jobs > 1 every process
+    trains its own table on an equal share of the episodes and the tables are
+    averaged with merge_Q(). That only approximates one process training on all
+    the episodes: no worker learns from the others' games, so values propagate
+    back through fewer updates each.
+
+    With eval_games > 0 every window of `report_every` episodes adds a row of
+    statistics (see metrics) to `stats` and to `log`. With several jobs a row
+    is added once every process has finished the window: episodes, speed and
+    Q changes are summed over the processes, and the win rates are those of
+    their tables merged with merge_Q(), as the finished table will be.
+    """
+
+    def __init__(self, episodes: int, jobs: int = 1, epsilon: float = 0.9, alpha: float = 0.3,
+                 gamma: float = 0.9, seed: Optional[int] = None, report_every: int = 1000,
+                 eval_games: int = 0, log: Optional[MetricsLog] = None):
+        self.episodes = episodes
+        self.jobs = max(1, min(jobs, episodes))
+        self.epsilon = epsilon
+        self.alpha = alpha
+        self.gamma = gamma
+        self.seed = seed
+        self.report_every = report_every
+        self.eval_games = eval_games
+        self.log = log
+        self.stats: List[Dict] = []
+        self.episodes_done = 0
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.Q: Optional[QTable] = None
+        self._stop = threading.Event()
+        self._processes: List[multiprocessing.Process] = []
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def progress(self) -> float:
+        return self.episodes_done / self.episodes if self.episodes else 1.0
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop early; processes are terminated and their tables are lost"""
+        self._stop.set()
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+
+    def join(self, timeout: Optional[float] = None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _count(self, done: int):
+        self.episodes_done = done
+
+    def _add_stats(self, row: Dict):
+        self.stats.append(row)
+        if self.log is not None:
+            self.log.write(row)
+
+    def _run(self):
+        try:
+            if self.jobs == 1:
+                if self.seed is not None:
+                    np.random.seed(self.seed)
+                on_stats = self._add_stats if self.eval_games else None
+                self.Q = train(self.episodes, self.epsilon, self.alpha, self.gamma,
+                               on_progress=self._count, report_every=self.report_every, stop=self._stop,
+                               on_stats=on_stats, eval_games=self.eval_games)
+            else:
+                self.Q = self._run_processes()
+        except BaseException as e:
+            self.error = e
+        finally:
+            self.done = True
+
+    def _run_processes(self) -> QTable:
+        results = multiprocessing.Queue()
+        base_seed = self.seed if self.seed is not None else int(np.random.randint(2 ** 31))
+        shares = [self.episodes // self.jobs + (1 if i < self.episodes % self.jobs else 0) for i in range(self.jobs)]
+        for shard, episodes in enumerate(shares):
+            process = multiprocessing.Process(
+                target=_train_shard, daemon=True,
+                args=(results, shard, episodes, base_seed + shard, self.epsilon, self.alpha, self.gamma,
+                      self.report_every, bool(self.eval_games)))
+            self._processes.append(process)
+            process.start()
+
+        # Windows each process has sent but that are not in a row yet
+        pending: List[List] = [[] for _ in shares]
+        windows = [-(-episodes // self.report_every) for episodes in shares]
+        latest: List[QTable] = [{} for _ in shares]
+        stats = WindowStats(self.eval_games, self.epsilon, self.alpha, self.gamma)
+        rows = 0
+        tables = []
+        while len(tables) < self.jobs and not self._stop.is_set():
+            try:
+                kind, shard, payload = results.get(timeout=0.1)
+            except Empty:
+                if self._stop.is_set():
+                    break
+                if not any(p.is_alive() for p in self._processes) and results.empty():
+                    raise RuntimeError("A training process exited without a result")
+                continue
+            if kind == "window":
+                self.episodes_done += payload[0]
+                if self.eval_games:
+                    pending[shard].append(payload)
+                    rows = self._add_merged_rows(stats, pending, windows, latest, rows)
+            else:
+                tables.append(payload)
+        for process in self._processes:
+            process.join(timeout=1.0)
+        return merge_Q(tables)
+
+    def _add_merged_rows(self, stats: WindowStats, pending: List[List], windows: List[int],
+                         latest: List[QTable], rows: int) -> int:
+        """Add a row for every window all processes have finished; returns the number of rows so far"""
+        while all(queue or windows[shard] <= rows for shard, queue in enumerate(pending)):
+            if not any(pending):
+                break
+            episodes = self.episodes_done - sum(batch for queue in pending for batch, _, _, _ in queue[1:])
+            for shard, queue in enumerate(pending):
+                if windows[shard] <= rows:
+                    continue
+                _, changes, updates, snapshot = queue.pop(0)
+                stats.add_changes(changes, updates)
+                latest[shard] = snapshot
+            self._add_stats(stats.row(merge_Q(latest), episodes))
+            rows += 1
+        return rows
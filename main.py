@@ -2,6 +2,7 @@ import os
 import sys
 import re
 import subprocess
+import multiprocessing
 
 GAME_ICONS = {
     "2048": "🎯",
@@ -128,6 +129,10 @@ def launch_game_subprocess(filepath):
         return False
 
 if __name__ == "__main__":
+    # Games start worker processes (Tic Tac Toe training, the Sudoku puzzle bank);
+    # in the frozen executable those workers re-run this file and must stop here
+    multiprocessing.freeze_support()
+
     # Check if we should run a game directly (from command line)
     if len(sys.argv) > 1 and sys.argv[1].endswith('.py'):
         filepath = sys.argv[1]
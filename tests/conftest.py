@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The games and their engine packages live in Source/ and import each other from there
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Source"))
@@ -0,0 +1,51 @@
+import random
+import time
+
+from Engine2048 import ExpectimaxPlayer, rules_for
+
+
+def _midgame_boards(count: int):
+    rules = rules_for(4)
+    rng = random.Random(7)
+    player = ExpectimaxPlayer(time_budget=0.005)
+    board = rules.spawn_tile(rules.spawn_tile(0, rng), rng)
+    boards = []
+    while len(boards) < count:
+        direction = player.choose_move(board)
+        if direction is None:
+            board = rules.spawn_tile(rules.spawn_tile(0, rng), rng)
+            continue
+        board = rules.spawn_tile(rules.move(board, direction)[0], rng)
+        boards.append(board)
+    return boards[-20:]
+
+
+def test_choose_move_keeps_to_its_budget():
+    budget = 0.05
+    player = ExpectimaxPlayer(time_budget=budget)
+    for board in _midgame_boards(200):
+        start = time.perf_counter()
+        direction = player.choose_move(board)
+        elapsed = time.perf_counter() - start
+        assert direction is not None
+        assert rules_for(4).move(board, direction)[0] != board
+        assert elapsed < budget + 0.02
+
+
+def test_no_budget_still_finds_a_move():
+    player = ExpectimaxPlayer(time_budget=0.0)
+    for board in _midgame_boards(50):
+        assert player.choose_move(board) is not None
+
+
+def test_lazy_heuristics_match_row_scores():
+    from Engine2048.ai import _row_heuristic
+
+    player = ExpectimaxPlayer()
+    rules = player.rules
+    for board in _midgame_boards(30):
+        columns = rules.transpose(board)
+        expected = sum(_row_heuristic((lines >> shift) & 0xFFFF) for lines in (board, columns)
+                       for shift in (0, 16, 32, 48))
+        assert player.evaluate(board) == expected
+        assert player.evaluate(board) == expected
@@ -0,0 +1,31 @@
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+from Engine2048 import DIRECTIONS, rules_for
+
+SOURCE = Path(__file__).resolve().parents[1] / "Source"
+
+
+def test_lazy_rows_match_full_slide():
+    for size in (3, 4, 5):
+        rules = rules_for(size)
+        rng = random.Random(size)
+        for _ in range(200):
+            grid = [[rng.choice((0, 0, 2, 2, 4, 8, 16)) for _ in range(size)] for _ in range(size)]
+            board = rules.from_grid(grid)
+            for direction in DIRECTIONS:
+                moved, score = rules.move(board, direction)
+                # Moving again hits the filled slots and must agree
+                assert rules.move(board, direction) == (moved, score)
+            left, score = rules.move(board, "Left")
+            expected = [rules.slide_row((board >> shift) & rules.row_mask) for shift in rules.row_shifts]
+            assert left == sum(row << shift for (row, _), shift in zip(expected, rules.row_shifts))
+            assert score == sum(points for _, points in expected)
+
+
+def test_import_does_not_load_simulation():
+    code = "import sys, Engine2048; print('Engine2048.simulate' in sys.modules, 'multiprocessing' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=SOURCE)
+    assert result.stdout.split() == ["False", "False"]
@@ -0,0 +1,22 @@
+import random
+import time
+
+import pytest
+
+from SudokuEngine import EASY, HARD, MEDIUM, count_solutions, generate_puzzle
+
+# Well inside generate_puzzle's 1 s time limit, which a reachable target never hits
+MAX_SECONDS = 0.5
+
+
+@pytest.mark.parametrize("blanks", [EASY, MEDIUM, HARD])
+def test_difficulty_reaches_blank_count_quickly(blanks):
+    for seed in range(10):
+        start = time.perf_counter()
+        puzzle, solution = generate_puzzle(blanks, random.Random(seed))
+        elapsed = time.perf_counter() - start
+
+        assert sum(row.count(0) for row in puzzle) == blanks
+        assert elapsed < MAX_SECONDS
+        assert count_solutions(puzzle, 2) == 1
+        assert all(p in (0, s) for p_row, s_row in zip(puzzle, solution) for p, s in zip(p_row, s_row))
@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from SudokuEngine import EASY, HARD, MEDIUM, generate_puzzle
+from SudokuEngine.grader import GRADES, TechniqueSolver, grade_puzzle
+
+
+@pytest.mark.parametrize("blanks", [EASY, MEDIUM, HARD])
+def test_techniques_never_remove_the_solution(blanks):
+    for seed in range(20):
+        puzzle, solution = generate_puzzle(blanks, random.Random(seed))
+        solver = TechniqueSolver(puzzle)
+        solved = solver.run()
+
+        answer = [value for row in solution for value in row]
+        for i, value in enumerate(solver.cells):
+            if value:
+                assert value == answer[i]
+            else:
+                assert solver.cands[i] & 1 << (answer[i] - 1)
+        if solved:
+            assert solver.cells == answer
+
+
+def test_grade_follows_hardest_technique():
+    puzzle, _ = generate_puzzle(EASY, random.Random(0))
+    grade, score = grade_puzzle(puzzle)
+    assert grade in GRADES
+    # This puzzle falls to singles alone, one or two points per cell
+    assert grade == "Easy" and EASY <= score <= 2 * EASY
+
+
+def test_cli_grades_a_file(tmp_path):
+    from SudokuEngine.__main__ import main
+
+    puzzles = ["".join(str(value) for row in generate_puzzle(blanks, random.Random(blanks))[0] for value in row)
+               for blanks in (EASY, MEDIUM, HARD)]
+    source, output = tmp_path / "puzzles.txt", tmp_path / "grades.txt"
+    source.write_text("\n".join(puzzles) + "\n")
+
+    assert main([str(source), "--grade", "-j", "2", "-o", str(output)]) == 0
+    lines = [line.split(",") for line in output.read_text().splitlines()]
+    assert [(puzzle, grade, int(score)) for puzzle, grade, score in lines] == \
+        [(puzzle, *grade_puzzle(puzzle)) for puzzle in puzzles]
@@ -0,0 +1,33 @@
+import pytest
+
+from SudokuEngine import SudokuSolver, count_solutions, parse_board, solve
+
+HARD_PUZZLES = [
+    "800000000003600000070090200050007000000045700000100030001000068008500010090000400",
+    "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+    "1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3..",
+]
+
+
+def _valid(grid):
+    groups = ([row for row in grid] + [list(col) for col in zip(*grid)]
+              + [[grid[r][c] for r in range(br, br + 3) for c in range(bc, bc + 3)]
+                 for br in (0, 3, 6) for bc in (0, 3, 6)])
+    return all(sorted(group) == list(range(1, 10)) for group in groups)
+
+
+@pytest.mark.parametrize("puzzle", HARD_PUZZLES)
+def test_hard_puzzles_solve_to_their_givens(puzzle):
+    solution = solve(puzzle)
+    assert solution is not None and _valid(solution)
+    assert all(given in (0, value) for given, value in zip(parse_board(puzzle), sum(solution, [])))
+    assert count_solutions(puzzle) == 1
+
+
+def test_counts_stop_at_the_limit_and_find_contradictions():
+    puzzle = "0" * 81
+    assert count_solutions(puzzle, 3) == 3
+    # Two 5s in the first row
+    assert count_solutions("55" + "0" * 79) == 0
+    # The first cell can only be 9, which is already in its column
+    assert SudokuSolver("012345678" + "0" * 9 + "9" + "0" * 62).count_solutions() == 0
@@ -0,0 +1,42 @@
+import csv
+
+from TicTacToeEngine import MetricsLog, Trainer
+
+
+def test_write_after_close_keeps_row_in_memory(tmp_path):
+    path = tmp_path / "metrics.csv"
+    log = MetricsLog(str(path))
+    log.write({"episodes": 1000})
+    log.close()
+    log.write({"episodes": 2000})
+
+    assert [row["episodes"] for row in log.rows] == [1000, 2000]
+    with open(path, newline="") as file:
+        assert [row["episodes"] for row in csv.DictReader(file)] == ["1000"]
+
+
+def test_stopped_trainer_can_be_joined_before_closing_its_log(tmp_path):
+    log = MetricsLog(str(tmp_path / "metrics.jsonl"))
+    trainer = Trainer(100000, jobs=1, eval_games=10, report_every=100, log=log)
+    trainer.start()
+    while not log.rows and not trainer.done:
+        trainer.join(0.01)
+    trainer.stop()
+    trainer.join()
+    log.close()
+
+    assert trainer.done and trainer.error is None
+    assert trainer.episodes_done < 100000
+
+
+def test_sharded_rows_cover_all_processes():
+    trainer = Trainer(3001, jobs=2, seed=3, eval_games=10, report_every=500)
+    trainer.start()
+    trainer.join()
+
+    assert trainer.error is None
+    # 1501 and 1500 episodes make four and three windows of 500
+    assert [row["episodes"] for row in trainer.stats] == [1000, 2000, 3000, 3001]
+    assert trainer.episodes_done == 3001
+    # The last row evaluates the merged table that training returns
+    assert trainer.stats[-1]["q_states"] == len(trainer.Q)
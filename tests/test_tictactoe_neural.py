@@ -0,0 +1,33 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from TicTacToeEngine import Board
+from TicTacToeEngine.neural import NetworkPlayer, _networks, export, load_network, move_time, train_network
+
+
+@pytest.fixture(scope="module")
+def network(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("network") / "Bot_Network.pt")
+    export(train_network(300, batch_games=100, seed=0), path)
+    return load_network(path)
+
+
+def test_network_is_loaded_once(network):
+    path = next(path for path, loaded in _networks.items() if loaded is network)
+    assert load_network(path) is network
+
+
+def test_network_player_plays_legal_moves(network):
+    board = Board()
+    players = {"X": NetworkPlayer("X", network), "O": NetworkPlayer("O", network, lookahead=True)}
+    mark = "X"
+    while not board.over():
+        move = players[mark].get_move(board)
+        assert move in board.available_moves()
+        board.place_mark(move, mark)
+        mark = "O" if mark == "X" else "X"
+
+
+def test_move_takes_under_a_millisecond(network):
+    assert move_time(network) < 1e-3
@@ -0,0 +1,30 @@
+import pickle
+
+import numpy as np
+
+from TicTacToeEngine import QTable, legacy_key
+from TicTacToeEngine.qtable import CELLS, split_key
+
+
+def _old_key(key: int) -> str:
+    """The string key older versions built from the float grid"""
+    x, o, mark = split_key(key)
+    return "".join("1" if x >> cell & 1 else "0" if o >> cell & 1 else "9" for cell in range(CELLS)) + mark
+
+
+def test_legacy_key_matches_make_key():
+    assert legacy_key("999999999X") == 0
+    assert legacy_key("199919990O") == (0b000010001 << 10) | (0b100000000 << 1) | 1
+
+
+def test_old_pickle_converts_like_the_dict(tmp_path):
+    table = QTable()
+    rng = np.random.default_rng(1)
+    table.values[:] = np.where(np.isnan(table.values), np.nan, rng.random(table.values.shape))
+    Q = {key: dict(table[key]) for key in table}
+    path = tmp_path / "Bot_Training.p"
+    with open(path, "wb") as file:
+        pickle.dump({_old_key(key): Qs for key, Qs in Q.items()}, file)
+
+    converted = QTable.from_legacy(str(path))
+    assert np.array_equal(converted.values, table.values, equal_nan=True)